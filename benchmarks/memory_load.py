@@ -0,0 +1,44 @@
+"""Compare loading analyzed inputs, and reading the same analyses from each, between the binary format and the legacy exec() path."""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.language.core.analysis import processor
+from modules.language.core.memory import loading, saving
+
+ANALYSES = ("byte", "delta", "xor")  # Read from every record on both paths
+
+def read(memory):
+    """Use a loaded memory the way training does: read its length and each analysis in ANALYSES."""
+    analysis = memory["analysis"]
+    return memory["metadata"]["length"] + sum(len(analysis[name]) for name in ANALYSES)
+
+def bench(count, size):
+    text = ("The quick brown fox jumps over the lazy dog. " * (size // 45 + 1))[:size]
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy, binary = Path(tmp) / "legacy", Path(tmp) / "binary"
+        legacy.mkdir()
+        binary.mkdir()
+        for i in range(count):
+            result = processor.process(text)
+            result.timestamp = f"bench_{i:09d}"
+            (legacy / f"user_input_{i:09d}.py").write_text(f"analyzed = {repr(result)}\n")
+            saving.write_input_binary(result, binary)
+
+        start = time.perf_counter()
+        legacy_total = sum(read(loading.load_legacy(file)) for file in legacy.glob("*.py"))
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        binary_total = sum(read(loading.load_input(file)) for file in binary.glob("*.bin"))
+        binary_time = time.perf_counter() - start
+        assert legacy_total == binary_total, (legacy_total, binary_total)
+
+    print(f"{count:6} files x {size:8} bytes | exec: {legacy_time:8.4f}s | mmap: {binary_time:8.4f}s | {legacy_time / binary_time:7.1f}x")
+
+if __name__ == "__main__":
+    for count, size in [(1000, 16), (200, 1024), (10, 65536)]:
+        bench(count, size)
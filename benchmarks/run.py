@@ -0,0 +1,288 @@
+"""
+Benchmark suite for the hot paths: analysis, training, prediction, persistence and the experimental engines.
+
+Every case runs over a sweep of input sizes, from 1 byte up to --max-size
+(100 MB with --full), capped per case where the code under test is pure
+Python. Results are written as JSON to benchmarks/results/. A case slower
+than baseline * (1 + tolerance) counts as a regression and the run exits with
+status 1. Baselines are machine specific, so none is committed: without one
+the run stops with status 2 until --update-baseline stores one.
+
+    python benchmarks/run.py                    # sweep up to 1 MiB, compare against the baseline
+    python benchmarks/run.py --full             # sweep up to 100 MB
+    python benchmarks/run.py --filter basic.    # only cases whose name contains "basic."
+    python benchmarks/run.py --update-baseline  # store this run as the new baseline
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from modules.language.core.analysis import processor
+from modules.language.core.analysis.tools import ascii, binary, hex
+from modules.language.core.analysis.tools import byte as byte_tool, delta as delta_tool, xor as xor_tool
+from modules.language.core.algorithms import layered
+from modules.language.core.algorithms.basic import byte, delta, ngram, xor
+from modules.language.core.algorithms.experimental import dynamic, morphological, network
+from modules.language.core.algorithms.experimental.neuron import Neuron
+from modules.language.core.autonomy import daemon
+from modules.language.core.memory import loading, saving
+from modules.language.core.memory.log import MemoryLog
+
+HERE = Path(__file__).resolve().parent
+RESULTS_DIR = HERE / "results"
+BASELINE = HERE / "baseline.json"
+SIZES = [1, 1 << 10, 1 << 15, 1 << 20, 1 << 25, 100_000_000]
+MAX_SIZE = 1 << 20  # Default sweep limit; --full raises it to the largest size
+PYTHON_MAX = 1 << 20  # Cap for pure-Python per-byte loops
+SCRATCH = tempfile.TemporaryDirectory(prefix="bench_")
+TOLERANCE = 0.5  # Allowed slowdown against the baseline before a case fails
+MIN_TIME = 0.2  # Seconds each measurement runs for
+REPEAT = 3  # Measurements per case; the best one is kept
+
+WORDS = ("the quick brown fox jumps over the lazy dog while John Smith watched the game "
+         "and the team was happy with a great score on Monday 2024-01-15 call 555-1234 ").split()
+
+def text_of(size):
+    """Deterministic English-like text of exactly size bytes."""
+    words = random.Random(size).choices(WORDS, k=size // 4 + 1)
+    return " ".join(words)[:size]
+
+def scratch():
+    """Fresh directory for persistence cases, removed when the run ends."""
+    return Path(tempfile.mkdtemp(dir=SCRATCH.name))
+
+def bytes_of(size):
+    return text_of(size).encode("utf-8")
+
+# Each case builder takes the input size and returns the zero-argument function to time.
+
+def process_case(size):
+    text = text_of(size)
+    return lambda: processor.process(text).to_dict()
+
+def tool_case(tool):
+    def build(size):
+        data = list(bytes_of(size))
+        return lambda: tool.analyze(data)
+    return build
+
+def train_case(model):
+    def build(size):
+        text = text_of(size)
+        return lambda: model.train(processor.process(text))
+    return build
+
+def predict_case(model):
+    def build(size):
+        data = bytes_of(size)
+        return lambda: model.predict(data)
+    return build
+
+def byte_predict_case(size):
+    result = processor.process(text_of(size))
+    return lambda: byte.predict(result)
+
+def ngram_case(size):
+    data = bytes_of(size)
+    return lambda: ngram.train_stream(data)
+
+def layered_case(size):
+    data = bytes_of(size)
+    return lambda: layered.learn(data)
+
+def write_case(write):
+    def build(size):
+        result = processor.process(text_of(size))
+        directory = scratch()
+        return lambda: write(result, directory)
+    return build
+
+def write_learned_case(size):
+    directory = scratch()
+    return lambda: saving.write_learned_binary(delta.elements, directory)
+
+def daemon_load_case(size):
+    log = MemoryLog(scratch(), sync_interval=0)
+    sequence = log.append_input(processor.process(text_of(size)))
+    return lambda: daemon.train_batch(log, [sequence], None, 0)
+
+def load_case(size):
+    directory = scratch()
+    path = saving.write_input_binary(processor.process(text_of(size)), directory)
+    return lambda: loading.load_memory(path)["analysis"]["delta"]
+
+def observations(size):
+    rng = random.Random(size)
+    return [(x, y, rng.choice((x + y, x ^ y, rng.randrange(256)))) for x, y in
+            ((rng.randrange(128), rng.randrange(128)) for _ in range(size))]
+
+def evaluate_rules_case(size):
+    observed = observations(size)
+    rules = morphological.generate_rules()
+    return lambda: morphological.evaluate_rules(rules, observed)
+
+def evaluate_rule_arrays_case(size):
+    observed = observations(size)
+    arrays = morphological.generate_rule_arrays()
+    return lambda: morphological.evaluate_rule_arrays(arrays, observed)
+
+def evolve_case(size):
+    random.seed(0)
+    rules = morphological.evaluate_rules(morphological.generate_rules(), observations(size))
+    return lambda: morphological.evolve(rules)
+
+def neuron_case(size):
+    neuron = Neuron(size)
+    neighbors = [Neuron(1) for _ in range(size)]
+    for i, neighbor in enumerate(neighbors):
+        neighbor.activation = 255 * (i % 2)
+    return lambda: neuron.update(neighbors)
+
+def network_case(size):
+    rng = np.random.default_rng(0)
+    net = network.Network(size, rng.integers(0, size, (size, 16)))
+    net.activation[:] = rng.integers(0, 256, size)
+    return net.step
+
+def analyzer_case(analyze):
+    def build(size):
+        text = text_of(size)
+        return lambda: analyze(text)
+    return build
+
+def analyze_message_case(size):
+    text = text_of(size)
+    return lambda: dynamic.analyze_message(text)
+
+# name -> (builder, largest size worth running, unit of size)
+CASES = {
+    "processor.process": (process_case, PYTHON_MAX, "bytes"),
+    "tools.ascii.analyze": (tool_case(ascii), PYTHON_MAX, "bytes"),
+    "tools.binary.analyze": (tool_case(binary), PYTHON_MAX, "bytes"),
+    "tools.byte.analyze": (tool_case(byte_tool), PYTHON_MAX, "bytes"),
+    "tools.delta.analyze": (tool_case(delta_tool), PYTHON_MAX, "bytes"),
+    "tools.hex.analyze": (tool_case(hex), PYTHON_MAX, "bytes"),
+    "tools.xor.analyze": (tool_case(xor_tool), PYTHON_MAX, "bytes"),
+    "basic.delta.train": (train_case(delta), None, "bytes"),
+    "basic.xor.train": (train_case(xor), None, "bytes"),
+    "basic.byte.train": (train_case(byte), None, "bytes"),
+    "basic.delta.predict": (predict_case(delta), None, "bytes"),
+    "basic.xor.predict": (predict_case(xor), None, "bytes"),
+    "basic.byte.predict": (byte_predict_case, None, "bytes"),
+    "basic.ngram.train_stream": (ngram_case, None, "bytes"),
+    "layered.learn": (layered_case, None, "bytes"),
+    "saving.write_input": (write_case(saving.write_input), PYTHON_MAX, "bytes"),
+    "saving.write_input_binary": (write_case(saving.write_input_binary), None, "bytes"),
+    "saving.write_learned_binary": (write_learned_case, 1, "tables"),
+    "loading.load_memory": (load_case, None, "bytes"),
+    "daemon.train_batch": (daemon_load_case, None, "bytes"),
+    "morphological.evaluate_rules": (evaluate_rules_case, 1 << 12, "observations"),
+    "morphological.evaluate_rule_arrays": (evaluate_rule_arrays_case, 1 << 20, "observations"),
+    "morphological.evolve": (evolve_case, 1, "observations"),
+    "neuron.update": (neuron_case, 1 << 16, "neighbors"),
+    "network.step": (network_case, 1 << 20, "neurons"),
+    "dynamic.analyze_message": (analyze_message_case, PYTHON_MAX, "bytes"),
+    "dynamic.sentiment_analysis": (analyzer_case(lambda t: dynamic.sentiment_analysis(dynamic.tokenize(t))), PYTHON_MAX, "bytes"),
+    "dynamic.extract_entities": (analyzer_case(dynamic.extract_entities), PYTHON_MAX, "bytes"),
+    "dynamic.classify_text": (analyzer_case(dynamic.classify_text), PYTHON_MAX, "bytes"),
+    "dynamic.summarize": (analyzer_case(dynamic.summarize), PYTHON_MAX, "bytes"),
+}
+
+def measure(fn, min_time=MIN_TIME, repeat=REPEAT):
+    """Best seconds per call over repeat runs of at least min_time each."""
+    start = time.perf_counter()
+    fn()
+    once = time.perf_counter() - start
+    loops = max(1, int(min_time / once)) if once > 0 else 1000
+    best = once
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+def run(names, max_size, min_time=MIN_TIME, repeat=REPEAT):
+    results = {}
+    for name in names:
+        build, cap, unit = CASES[name]
+        for size in SIZES:
+            if size > max_size or (cap is not None and size > cap):
+                break
+            seconds = measure(build(size), min_time, repeat)
+            key = f"{name}@{size}"
+            results[key] = {"seconds": seconds, "size": size, "unit": unit,
+                            "per_second": size / seconds if seconds > 0 else None}
+            rate = f"{size / seconds / 1e6:10.2f} M{unit}/s" if seconds > 0 else ""
+            print(f"{key:48} {seconds * 1e3:12.4f} ms {rate}", flush=True)
+    return results
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Keys of cases slower than the baseline by more than tolerance, with their slowdown."""
+    regressions = {}
+    for key, result in results.items():
+        before = baseline.get(key)
+        if before and before["seconds"] > 0:
+            ratio = result["seconds"] / before["seconds"]
+            if ratio > 1 + tolerance:
+                regressions[key] = ratio
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--full", action="store_true", help="sweep up to 100 MB")
+    parser.add_argument("--max-size", type=int, default=MAX_SIZE)
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--min-time", type=float, default=MIN_TIME)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--output", type=Path, help="results file (default: results/<timestamp>.json)")
+    args = parser.parse_args(argv)
+    if not args.update_baseline and not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline on this machine to store one.",
+              file=sys.stderr)
+        return 2
+
+    names = [name for name in CASES if args.filter in name]
+    results = run(names, SIZES[-1] if args.full else args.max_size, args.min_time, args.repeat)
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.platform(),
+        },
+        "results": results,
+    }
+    output = args.output or RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results saved to {output}")
+
+    if args.update_baseline:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {"results": {}}
+        baseline["meta"] = report["meta"]
+        baseline["results"].update(results)
+        args.baseline.write_text(json.dumps(baseline, indent=2))
+        print(f"Baseline updated at {args.baseline}")
+        return 0
+
+    regressions = compare(results, json.loads(args.baseline.read_text())["results"], args.tolerance)
+    for key, ratio in sorted(regressions.items()):
+        print(f"REGRESSION {key}: {ratio:.2f}x slower than baseline")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
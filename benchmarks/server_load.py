@@ -0,0 +1,107 @@
+"""
+Load client for the ingestion server: throughput and tail latency under many concurrent clients.
+
+Without --port or --unix a server is started in a subprocess on a scratch
+directory and stopped afterwards, so a run never touches data/.
+
+    python benchmarks/server_load.py --clients 100 --requests 200
+    python benchmarks/server_load.py --port 8765 --clients 500
+"""
+import argparse
+import asyncio
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+WORDS = "the quick brown fox jumps over the lazy dog while the team was happy with a great score".split()
+
+def lines(count, distinct, seed):
+    rng = random.Random(seed)
+    pool = [" ".join(rng.choices(WORDS, k=rng.randint(3, 20))) for _ in range(distinct)]
+    return [(rng.choice(pool) + "\n").encode("utf-8") for _ in range(count)]
+
+async def client(connect, requests, latencies, distinct, seed):
+    reader, writer = await connect()
+    for line in lines(requests, distinct, seed):
+        start = time.perf_counter()
+        writer.write(line)
+        await reader.readline()
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+    await writer.wait_closed()
+
+async def load(connect, clients, requests, distinct):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(connect, requests, latencies, distinct, seed) for seed in range(clients)))
+    return time.perf_counter() - start, sorted(latencies)
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+async def wait_for(connect, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await connect()
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--unix")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=200, help="requests per client")
+    parser.add_argument("--distinct", type=int, default=1000, help="distinct lines each client picks from")
+    args = parser.parse_args()
+
+    server = None
+    scratch = None
+    if args.port is None and args.unix is None:
+        scratch = tempfile.TemporaryDirectory(prefix="server_load_")
+        args.unix = os.path.join(scratch.name, "server.sock")
+        server = subprocess.Popen([sys.executable, "-m", "modules.language.core.interface.server",
+                                   "--unix", args.unix,
+                                   "--log-dir", os.path.join(scratch.name, "log"),
+                                   "--legacy-dir", os.path.join(scratch.name, "input"),
+                                   "--snapshot-dir", os.path.join(scratch.name, "snapshots"),
+                                   "--cursor-path", os.path.join(scratch.name, "cursor.json")],
+                                  cwd=ROOT, stdout=subprocess.DEVNULL)
+
+    if args.unix:
+        connect = lambda: asyncio.open_unix_connection(args.unix)
+    else:
+        connect = lambda: asyncio.open_connection(args.host, args.port)
+
+    async def session():
+        await wait_for(connect)
+        return await load(connect, args.clients, args.requests, args.distinct)
+
+    try:
+        elapsed, latencies = asyncio.run(session())
+    finally:
+        if server is not None:
+            server.send_signal(signal.SIGINT)
+            server.wait()
+            scratch.cleanup()
+
+    total = len(latencies)
+    print(f"{args.clients} clients x {args.requests} requests: {total / elapsed:,.0f} requests/s")
+    for p in (50, 90, 99, 99.9):
+        print(f"  p{p:<5} {percentile(latencies, p) * 1e3:8.3f} ms")
+    print(f"  max    {latencies[-1] * 1e3:8.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Scaling of ShardedNetwork from 1 to N worker processes against the single-process Network."""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from modules.language.core.algorithms.experimental.network import Network
+from modules.language.core.algorithms.experimental.sharded import ShardedNetwork
+
+def build(size, degree, seed=0):
+    rng = np.random.default_rng(seed)
+    network = Network(size, rng.integers(0, size, (size, degree)))
+    network.activation[:] = rng.integers(0, 256, size)
+    return network
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--neurons", type=int, default=200_000)
+    parser.add_argument("--degree", type=int, default=32)
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    network = build(args.neurons, args.degree)
+    start = time.perf_counter()
+    for _ in range(args.ticks):
+        network.step()
+    single = (time.perf_counter() - start) / args.ticks
+    synapses = args.neurons * args.degree
+    print(f"{args.neurons} neurons x {args.degree} synapses, {args.ticks} ticks on {os.cpu_count()} cores")
+    print(f"Network         {single * 1e3:9.2f} ms/tick {synapses / single / 1e6:9.1f} M synapses/s")
+
+    counts = sorted({1 << i for i in range(args.max_workers.bit_length())} | {args.max_workers})
+    for workers in counts:
+        with ShardedNetwork.from_network(build(args.neurons, args.degree), workers) as sharded:
+            sharded.run(1)  # Warm up the workers
+            start = time.perf_counter()
+            sharded.run(args.ticks)
+            elapsed = (time.perf_counter() - start) / args.ticks
+        print(f"{workers:3} workers     {elapsed * 1e3:9.2f} ms/tick {synapses / elapsed / 1e6:9.1f} M synapses/s"
+              f" {single / elapsed:6.2f}x")
+
+if __name__ == "__main__":
+    main()
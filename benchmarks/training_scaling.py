@@ -0,0 +1,57 @@
+"""Scaling of training.train_records from 1 to N worker processes against counting in-process."""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.language.core.autonomy import training
+from modules.language.core.memory import format
+from modules.language.core.memory.log import MemoryLog
+
+def build(directory, records, size, seed=0):
+    """A memory log of records random inputs of size bytes each; returns their locations."""
+    rng = random.Random(seed)
+    log = MemoryLog(directory, sync_interval=0)
+    sequences = [log.append(format.KIND_INPUT, rng.randbytes(size), "20240101_000000") for _ in range(records)]
+    locations = [log.locate(sequence) for sequence in sequences]
+    log.close()
+    return locations
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--size", type=int, default=4096, help="bytes per record")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="training_scaling_") as scratch:
+        locations = build(scratch, args.records, args.size)
+        total = args.records * args.size
+        single = min(timed(lambda: training.reduce([training.count_records(locations)]))
+                     for _ in range(args.repeat))
+        print(f"{args.records} records x {args.size} bytes on {os.cpu_count()} cores")
+        print(f"in-process      {single * 1e3:9.1f} ms {total / single / 1e6:9.1f} MB/s")
+
+        counts = sorted({1 << i for i in range(args.max_workers.bit_length())} | {args.max_workers})
+        for workers in counts:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                training.train_records(locations[:workers], executor, workers)  # Warm up the workers
+                elapsed = min(timed(lambda: training.train_records(locations, executor, workers))
+                              for _ in range(args.repeat))
+            print(f"{workers:3} workers     {elapsed * 1e3:9.1f} ms {total / elapsed / 1e6:9.1f} MB/s"
+                  f" {single / elapsed:6.2f}x")
+
+if __name__ == "__main__":
+    main()
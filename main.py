@@ -2,28 +2,51 @@ import sys
 import threading
 from modules.language.core.autonomy import daemon
 from modules.language.core.analysis import processor
-from modules.language.core.memory import saving
+from modules.language.core.memory import saving, snapshot
+from modules.language.core.memory.log import MemoryLog
 from modules.language.core.algorithms.basic import delta
+from modules.language.core.instrumentation import metrics
+from modules.language.core.interface import server
 
 def main():
-    daemon_thread = threading.Thread(target=daemon.run, daemon=True)
+    log = MemoryLog()
+    inputs = saving.DedupStore(log, legacy_dir="data/neural/language/input/user/")
+    inputs.start_compaction()
+    # Restore before the first input is trained; the daemon then starts from this snapshot instead of racing to load it
+    restored = snapshot.restore()
+    daemon_thread = threading.Thread(target=daemon.run, kwargs={"restored": restored}, daemon=True)
     daemon_thread.start()
+    metrics.setup()
     try:
         while True:
             print("Main thread is running. Press Ctrl+C to exit.")
             text = input("Enter text: ")
-            result = processor.process(text)
+            with metrics.timer("main_stage_seconds", stage="analysis"):
+                result, seen, key = processor.process_cached(text)
+            metrics.count("main_inputs_total", duplicate=seen)
             print(result)
-            saving.write_input(result, "data/neural/language/input/user/")
-            print("Saved to data/neural/language/input/user/")
-            learned = delta.train (result)
-            print(learned)
-            saving.write_learned(learned, "data/neural/language/learned/delta")
-            print("Saved to data/neural/language/learned/delta")
-            predict = delta.predict (result["analysis"]["byte"])
+            with metrics.timer("main_stage_seconds", stage="save"):
+                sequence, written = inputs.write(result, key)
+            if written:
+                print(f"Saved as record {sequence} in {log.directory}")
+                with metrics.timer("main_stage_seconds", stage="train"):
+                    learned = delta.train (result)
+                print(learned)
+                with metrics.timer("main_stage_seconds", stage="save"):
+                    log.append_learned(learned)
+                print(f"Saved learned delta table in {log.directory}")
+            else:
+                print("Already saved as record", sequence)
+            with metrics.timer("main_stage_seconds", stage="predict"):
+                predict = delta.predict (result["analysis"]["byte"])
             print("Prediction based on delta algorithm:", predict)
     except KeyboardInterrupt:
+        log.close()  # Stops compaction first, so the index is written after its last change
+        inputs.flush()
         print("\nExiting cleanly.")
         sys.exit(0)
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:2] == ["serve"]:
+        server.main(sys.argv[2:])
+    else:
+        main()
@@ -1,12 +1,36 @@
+import threading
+import numpy as np
+from modules.language.core.algorithms.basic import histogram
+from modules.language.core.analysis import vectorized
+
 elements = [0] * 256  # 8-bit space
+lock = threading.Lock()  # Guards elements against concurrent trainers
+CONTEXT = 0  # Previous bytes each scored position depends on
+
+def indices(byte_data):
+    return histogram.values(byte_data)
+
+def pattern(values):
+    return values
+
+def count(memory):
+    return histogram.count(indices(memory["analysis"]["byte"]))
+
+def merge(counts):
+    with lock:
+        return histogram.accumulate(elements, counts)
 
 def train(memory):
-    byte_data = memory["analysis"]["byte"]
-    for byte in byte_data:
-        elements[byte] = min(elements[byte] + 1, 255)
-    return elements
+    return merge(count(memory))
+
+def train_many(memories):
+    return merge(sum(count(memory) for memory in memories))
 
 def predict(result):
     byte_input = result["analysis"]["byte"]
-    return sum(elements[b] for b in byte_input)
+    return int(np.asarray(elements)[pattern(histogram.values(byte_input))].sum())
 
+def predict_many(byte_inputs):
+    batch = vectorized.analyze_batch(byte_inputs)
+    scores = np.asarray(elements)[batch["byte"]]
+    return histogram.segment_sums(scores, batch["offsets"])
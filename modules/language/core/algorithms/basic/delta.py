@@ -1,12 +1,35 @@
+import threading
+import numpy as np
+from modules.language.core.algorithms.basic import histogram
+from modules.language.core.analysis import vectorized
+
 elements = [0] * 256  # 8-bit space
+lock = threading.Lock()  # Guards elements against concurrent trainers
+CONTEXT = 1  # Previous bytes each scored position depends on
+
+def indices(delta_values):
+    return histogram.values(delta_values) % 256  # Wrap into 8-bit space
+
+def pattern(values):
+    return (values[1:] - values[:-1]) & 0xFF  # Wrap into 8-bit space
+
+def count(memory):
+    return histogram.count(indices(memory["analysis"]["delta"]))
+
+def merge(counts):
+    with lock:
+        return histogram.accumulate(elements, counts)
 
 def train(memory):
-    delta_values = memory["analysis"]["delta"]
-    for val in delta_values:
-        index = val % 256  # Wrap into 8-bit space
-        elements[index] = min(elements[index] + 1, 255)
-    return elements
+    return merge(count(memory))
+
+def train_many(memories):
+    return merge(sum(count(memory) for memory in memories))
 
 def predict(byte_input):
-    delta_pattern = [(byte_input[i] - byte_input[i - 1]) % 256 for i in range(1, len(byte_input))]
-    return sum(elements[d] for d in delta_pattern)
+    return int(np.asarray(elements)[pattern(histogram.values(byte_input))].sum())
+
+def predict_many(byte_inputs):
+    batch = vectorized.analyze_batch(byte_inputs)
+    scores = np.asarray(elements)[indices(batch["delta"])]
+    return histogram.segment_sums(scores, batch["pair_offsets"])
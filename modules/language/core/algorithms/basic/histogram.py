@@ -0,0 +1,25 @@
+import numpy as np
+
+SIZE = 256  # 8-bit space
+LIMIT = 255  # Counts saturate at the top of the 8-bit range
+
+def values(data):
+    """Integer array over bytes-like data (zero-copy) or any sequence of ints."""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return np.frombuffer(data, dtype=np.uint8)
+    return np.asarray(data, dtype=np.int64)
+
+def count(indices):
+    """Unsaturated 256-bin histogram of indices that are already inside the 8-bit space."""
+    return np.bincount(indices, minlength=SIZE)
+
+def accumulate(elements, counts):
+    """Add counts to elements in place with one clamp; same result as n saturating increments."""
+    elements[:] = np.minimum(np.asarray(elements, dtype=np.int64) + counts, LIMIT).tolist()
+    return elements
+
+def segment_sums(scores, offsets):
+    """Sum scores[offsets[i]:offsets[i + 1]] for every i, empty segments included."""
+    totals = np.zeros(len(scores) + 1, dtype=np.int64)
+    np.cumsum(scores, out=totals[1:])
+    return totals[offsets[1:]] - totals[offsets[:-1]]
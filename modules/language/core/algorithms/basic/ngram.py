@@ -0,0 +1,127 @@
+import threading
+import numpy as np
+from modules.language.core.algorithms.basic import histogram
+
+# Order-N byte model: counts of the next byte after every N-byte context.
+# Contexts index the rows of a fixed 2**BITS x 256 uint8 table, directly when
+# N bytes fit in BITS, otherwise through a multiplicative hash, so memory use
+# is fixed up front (16 MiB for the defaults) whatever the input size. The
+# table is stored flat, indexed by pattern() like the other basic models, so
+# stream.StreamScorer can score with it directly.
+ORDER = 2  # Context bytes (1-8)
+BITS = 16  # log2 of the number of context rows
+HASH = np.uint64(0x9E3779B97F4A7C15)
+
+elements = np.zeros(256 << BITS, dtype=np.uint8)  # 8-bit space, saturating counts, row-major by context
+lock = threading.Lock()  # Guards elements against concurrent trainers
+CONTEXT = ORDER  # Previous bytes each scored position depends on
+history = b""  # Last ORDER bytes seen by train_stream
+
+def configure(order=ORDER, bits=BITS):
+    """Change the model order and table size; this resets everything learned."""
+    global ORDER, BITS, CONTEXT, elements, history
+    if not 1 <= order <= 8:
+        raise ValueError("order must be between 1 and 8")
+    with lock:
+        ORDER, BITS, CONTEXT = order, bits, order
+        elements = np.zeros(256 << bits, dtype=np.uint8)
+        history = b""
+
+BLOCK = 1 << 24  # Positions counted per bincount pass on large inputs
+DENSE_LIMIT = 1 << 26  # Largest table counted with a dense bincount (512 MiB of int64)
+
+def packed(values, width, dtype):
+    """The `width` bytes starting at every position (with width more to follow), big-endian in one int."""
+    n = len(values) - width
+    out = values[:n].astype(dtype)
+    for k in range(1, width):
+        out <<= 8
+        out |= values[k:k + n]
+    return out
+
+def rows(values):
+    """Context row of every position that has ORDER bytes before it."""
+    if len(values) <= ORDER:
+        return np.empty(0, dtype=np.int64)
+    if ORDER * 8 <= BITS:
+        return packed(values, ORDER, np.int64)
+    return ((packed(values, ORDER, np.uint64) * HASH) >> np.uint64(64 - BITS)).astype(np.int64)
+
+def pattern(values):
+    """Flat table index (context row * 256 + next byte) of every scored position."""
+    values = np.asarray(values).astype(np.uint8, copy=False)
+    if len(values) <= ORDER:
+        return np.empty(0, dtype=np.int64)
+    if ORDER * 8 <= BITS:
+        # Direct rows: the flat index is just the context bytes followed by the next byte
+        return packed(np.append(values, 0), ORDER + 1, np.int32 if ORDER < 3 else np.int64)
+    return rows(values) * 256 + values[ORDER:]
+
+def count(data):
+    """Unsaturated counts as (flat indices, counts), sized by the input rather than the table."""
+    values = histogram.values(data)
+    positions = len(values) - ORDER
+    if positions > BLOCK and elements.size <= DENSE_LIMIT:
+        # Large inputs: dense bincount, one block at a time to bound temporaries
+        counts = np.zeros(elements.size, dtype=np.int64)
+        for start in range(0, positions, BLOCK):
+            counts += np.bincount(pattern(values[start:start + BLOCK + ORDER]), minlength=elements.size)
+        index = np.flatnonzero(counts)
+        return index, counts[index]
+    return tally(pattern(values))
+
+def tally(flat):
+    """(flat indices, counts) of the indices returned by pattern."""
+    if len(flat) > elements.size // 8 and elements.size <= DENSE_LIMIT:
+        counts = np.bincount(flat, minlength=elements.size)
+        index = np.flatnonzero(counts)
+        return index, counts[index]
+    return np.unique(flat, return_counts=True)
+
+def merge(counts):
+    index, n = counts
+    with lock:
+        elements[index] = np.minimum(elements[index].astype(np.int64) + n, 255)
+    return elements
+
+def train(memory):
+    return merge(count(memory["analysis"]["byte"]))
+
+def train_many(memories):
+    partials = [count(memory["analysis"]["byte"]) for memory in memories]
+    if not partials:
+        return elements
+    index, inverse = np.unique(np.concatenate([p[0] for p in partials]), return_inverse=True)
+    n = np.bincount(inverse, weights=np.concatenate([p[1] for p in partials]))
+    return merge((index, n.astype(np.int64)))
+
+def train_stream(chunk):
+    """Train on the next chunk of one continuous byte stream; contexts span chunk boundaries."""
+    global history
+    data = history + bytes(chunk)
+    history = data[-ORDER:]
+    return merge(count(data))
+
+def reset_stream():
+    global history
+    history = b""
+
+def distribution(context):
+    """Next-byte counts (256 entries) after the last ORDER bytes of context."""
+    context = bytes(context)[-ORDER:]
+    if len(context) < ORDER:
+        return np.zeros(256, dtype=np.uint8)
+    row = int(rows(np.frombuffer(context + b"\0", dtype=np.uint8))[0])
+    return elements[row * 256:(row + 1) * 256]
+
+def predict_next(context):
+    """Most likely next byte after context, or None if the context was never seen."""
+    counts = distribution(context)
+    return int(counts.argmax()) if counts.any() else None
+
+def score(byte_input):
+    """Sum of learned counts for each byte of byte_input given the ORDER bytes before it."""
+    return int(elements[pattern(histogram.values(byte_input))].sum(dtype=np.int64))
+
+def predict(byte_input):
+    return score(byte_input)
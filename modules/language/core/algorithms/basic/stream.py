@@ -0,0 +1,58 @@
+import numpy as np
+from modules.language.core.algorithms.basic import histogram
+
+CHUNK_SIZE = 1 << 20
+
+class StreamScorer:
+    """
+    Rolling window scores for one basic model (byte, delta, xor or ngram) over a byte stream.
+
+    Bytes arrive in chunks of any size. Only the model's CONTEXT bytes (the last
+    byte for delta/xor) and the last window + 1 prefix sums are carried between
+    chunks, so memory does not depend on stream length. With prefix sums P,
+    the window of positions [k - window, k) scores P[k] - P[k - window].
+    """
+
+    def __init__(self, model, window):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.model = model
+        self.window = window
+        self.carry = np.empty(0, dtype=np.uint8)
+        self.prefix = np.zeros(1, dtype=np.int64)  # Last window + 1 prefix sums
+        self.scored = 0  # Positions scored so far
+
+    def feed(self, chunk):
+        """Score a chunk; returns the scores of every full window that ends inside it."""
+        values = np.concatenate((self.carry, histogram.values(chunk).astype(np.uint8, copy=False)))
+        context = self.model.CONTEXT
+        if len(values) <= context:
+            self.carry = values
+            return np.empty(0, dtype=np.int64)
+        self.carry = values[len(values) - context:] if context else values[:0]
+
+        # Gather from the table as stored and widen only the gathered counts
+        scores = np.asarray(self.model.elements)[self.model.pattern(values)].astype(np.int64)
+        extended = np.concatenate((self.prefix, self.prefix[-1] + np.cumsum(scores)))
+        self.scored += len(scores)
+        drop = max(0, len(self.prefix) - self.window)
+        self.prefix = extended[-(self.window + 1):]
+        return (extended[self.window:] - extended[:-self.window])[drop:]
+
+    def offset(self):
+        """Stream offset just past the last byte that has been scored."""
+        return self.scored + self.model.CONTEXT
+
+def scan(stream, model, window, chunk_size=CHUNK_SIZE):
+    """
+    Read a binary file object (file, socket.makefile("rb"), ...) chunk by chunk and
+    yield (end, scores): scores[i] is the window ending just before stream offset end + i.
+    """
+    scorer = StreamScorer(model, window)
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        scores = scorer.feed(chunk)
+        if len(scores):
+            yield scorer.offset() - len(scores) + 1, scores
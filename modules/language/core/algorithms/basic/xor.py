@@ -1,12 +1,36 @@
+import threading
+import numpy as np
+from modules.language.core.algorithms.basic import histogram
+from modules.language.core.analysis import vectorized
+
 elements = [0] * 256  # 8-bit space
+lock = threading.Lock()  # Guards elements against concurrent trainers
+CONTEXT = 1  # Previous bytes each scored position depends on
+
+def indices(xor_values):
+    values = histogram.values(xor_values)
+    return values[(values >= 0) & (values < 256)]
+
+def pattern(values):
+    return values[1:] ^ values[:-1]
+
+def count(memory):
+    return histogram.count(indices(memory["analysis"]["xor"]))
+
+def merge(counts):
+    with lock:
+        return histogram.accumulate(elements, counts)
 
 def train(memory):
-    xor_values = memory["analysis"]["xor"]
-    for val in xor_values:
-        if 0 <= val < 256:
-            elements[val] = min(elements[val] + 1, 255)
-    return elements
+    return merge(count(memory))
+
+def train_many(memories):
+    return merge(sum(count(memory) for memory in memories))
 
 def predict(byte_input):
-    xor_pattern = [(byte_input[i] ^ byte_input[i - 1]) for i in range(1, len(byte_input))]
-    return sum(elements[v] for v in xor_pattern)
+    return int(np.asarray(elements)[pattern(histogram.values(byte_input))].sum())
+
+def predict_many(byte_inputs):
+    batch = vectorized.analyze_batch(byte_inputs)
+    scores = np.asarray(elements)[batch["xor"]]
+    return histogram.segment_sums(scores, batch["pair_offsets"])
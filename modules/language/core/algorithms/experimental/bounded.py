@@ -0,0 +1,125 @@
+import heapq
+from collections import OrderedDict
+from itertools import count
+
+class LRUDict(OrderedDict):
+    """
+    Dict holding at most maxlen keys; reading or writing a key refreshes it, the stalest key is evicted.
+
+    Every way in (item access, get, setdefault, update, the initial items)
+    refreshes and trims. on_evict, if given, is called with the (key, value)
+    of every evicted entry.
+    """
+
+    def __init__(self, maxlen, default_factory=None, on_evict=None, items=()):
+        super().__init__()
+        self.maxlen = maxlen
+        self.default_factory = default_factory
+        self.on_evict = on_evict
+        self.update(items)
+
+    def __getitem__(self, key):
+        if key in self:
+            self.move_to_end(key)
+            return super().__getitem__(key)
+        if self.default_factory is None:
+            raise KeyError(key)
+        value = self.default_factory()
+        self[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        self.trim()
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def trim(self):
+        while len(self) > self.maxlen:
+            key, value = self.popitem(last=False)
+            if self.on_evict is not None:
+                self.on_evict(key, value)
+
+    def resize(self, maxlen):
+        self.maxlen = maxlen
+        self.trim()
+
+class SpaceSaving:
+    """
+    Bounded frequency counter with top-k queries (the Space-Saving algorithm).
+
+    At most capacity keys are tracked. A new key arriving when full replaces
+    the least frequent one and inherits its count, so heavy hitters are never
+    lost and counts overestimate by at most the evicted minimum.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.counts = {}
+        self.heap = []  # (count, order, key); stale entries are skipped lazily
+        self.order = count()
+
+    def add(self, key, n=1):
+        counts = self.counts
+        if key not in counts and len(counts) >= self.capacity:
+            counts[key] = self.evict() + n
+        else:
+            counts[key] = counts.get(key, 0) + n
+        heapq.heappush(self.heap, (counts[key], next(self.order), key))
+        if len(self.heap) > 4 * self.capacity:
+            self.rebuild()
+        return counts[key]
+
+    def evict(self):
+        """Remove the least frequent key and return its count."""
+        while True:
+            value, _, key = heapq.heappop(self.heap)
+            if self.counts.get(key) == value:
+                del self.counts[key]
+                return value
+
+    def rebuild(self):
+        self.heap = [(value, next(self.order), key) for key, value in self.counts.items()]
+        heapq.heapify(self.heap)
+
+    def resize(self, capacity):
+        self.capacity = capacity
+        while len(self.counts) > capacity:
+            self.evict()
+
+    def top(self, k):
+        """The k most frequent (key, count) pairs, most frequent first; ties keep arrival order."""
+        return heapq.nlargest(k, self.counts.items(), key=lambda item: item[1])
+
+    def most_common(self, k):
+        return self.top(k)
+
+    def __getitem__(self, key):
+        return self.counts.get(key, 0)
+
+    def __contains__(self, key):
+        return key in self.counts
+
+    def __iter__(self):
+        return iter(self.counts)
+
+    def __len__(self):
+        return len(self.counts)
+
+    def items(self):
+        return self.counts.items()
+
+    def __repr__(self):
+        return repr(self.counts)
@@ -0,0 +1,308 @@
+import re
+import numpy as np
+
+TOKEN_RE = re.compile(r'\b\w+\b')
+TRAILING_WORD_RE = re.compile(r'\w+\Z')  # \Z, not $, which also matches before a final newline
+CHUNK_SIZE = 1 << 22  # Characters read per corpus chunk
+PENDING_LIMIT = 1 << 20  # Buffered pair increments before they are merged into the matrix
+FRESH_MIN = 4096  # New pairs always held aside before one rewrite of the sorted arrays
+
+class Vocabulary:
+    """Interns words to dense integer ids; once max_words are known, new words are ignored (id -1)."""
+
+    def __init__(self, max_words=None):
+        self.max_words = max_words
+        self.ids = {}
+        self.words = []
+
+    def intern(self, word):
+        word_id = self.ids.get(word)
+        if word_id is None:
+            if self.max_words is not None and len(self.words) >= self.max_words:
+                return -1
+            word_id = self.ids[word] = len(self.words)
+            self.words.append(word)
+        return word_id
+
+    def lookup(self, word):
+        return self.ids.get(word, -1)
+
+    def __len__(self):
+        return len(self.words)
+
+class CooccurrenceMatrix:
+    """
+    Sparse word co-occurrence counts with cached top-k neighbors.
+
+    Counts live in two parallel arrays sorted by key (row id << 32 | column id),
+    so a row is a contiguous slice and each stored pair costs 12 bytes. Updates
+    are buffered and merged in bulk. Pairs already stored are counted in place.
+    New pairs go to a small sorted side level (fresh_keys, fresh_counts), and
+    that level is merged into the main arrays only once it outgrows the square
+    root of their size. A query therefore never pays for rewriting every stored
+    pair. The top-k neighbors of every word are kept up to date at merge time:
+    counts only grow, so a row's new top-k can only come from its old top-k and
+    the columns touched by the merge. Once max_pairs is exceeded the least
+    frequent pairs are pruned, which bounds memory; rows that lost pairs get
+    their top-k recomputed from the pairs they have left.
+    """
+
+    def __init__(self, k=3, max_pairs=10_000_000, max_words=1_000_000):
+        self.k = k
+        self.max_pairs = max_pairs
+        self.vocab = Vocabulary(max_words)
+        self.keys = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.uint32)
+        self.top = np.full((0, k), -1, dtype=np.int64)
+        self.fresh_keys = np.empty(0, dtype=np.int64)
+        self.fresh_counts = np.empty(0, dtype=np.uint32)
+        self.pending = []
+        self.pending_size = 0
+
+    def update(self, tokens, previous=-1):
+        """
+        Count adjacent, different words in tokens, in both directions.
+
+        Returns:
+            int: Id of the last token, to link the next batch when streaming.
+        """
+        ids = np.fromiter((self.vocab.intern(word) for word in tokens), dtype=np.int64, count=len(tokens))
+        if previous >= 0 and len(ids):
+            ids = np.concatenate(([previous], ids))
+        if len(ids) > 1:
+            a, b = ids[:-1], ids[1:]
+            valid = (a != b) & (a >= 0) & (b >= 0)
+            a, b = a[valid], b[valid]
+            self.pending.append(np.concatenate(((a << 32) | b, (b << 32) | a)))
+            self.pending_size += 2 * len(a)
+            if self.pending_size >= PENDING_LIMIT:
+                self.stage()
+        return int(ids[-1]) if len(ids) else previous
+
+    @staticmethod
+    def add_sorted(keys, counts, new_keys, new_counts):
+        """
+        Add new_counts to the counts of new_keys (unique, sorted) in place where present.
+
+        Returns:
+            tuple: (keys, counts) with the absent keys inserted, and the mask of new_keys that were absent.
+        """
+        pos = np.searchsorted(keys, new_keys)
+        found = pos < len(keys)
+        found[found] = keys[pos[found]] == new_keys[found]
+        counts[pos[found]] += new_counts[found].astype(np.uint32)
+        absent = ~found
+        keys = np.insert(keys, pos[absent], new_keys[absent])
+        counts = np.insert(counts, pos[absent], new_counts[absent].astype(np.uint32))
+        return keys, counts, absent
+
+    def stage(self):
+        """
+        Count buffered increments and refresh the affected top-k rows.
+
+        Stored pairs are updated in place and new pairs join the side level,
+        which is merged into the main arrays once it is large enough. The
+        cost depends on the buffered and side sizes, not on the stored pairs.
+        """
+        if not self.pending:
+            return
+        keys, counts = np.unique(np.concatenate(self.pending), return_counts=True)
+        self.pending = []
+        self.pending_size = 0
+
+        pos = np.searchsorted(self.keys, keys)
+        found = pos < len(self.keys)
+        found[found] = self.keys[pos[found]] == keys[found]
+        self.counts[pos[found]] += counts[found].astype(np.uint32)
+        self.fresh_keys, self.fresh_counts, _ = self.add_sorted(
+            self.fresh_keys, self.fresh_counts, keys[~found], counts[~found])
+
+        if len(self.keys) + len(self.fresh_keys) > self.max_pairs:
+            self.merge()
+            self.prune()
+        elif len(self.fresh_keys) > max(FRESH_MIN, int(np.sqrt(len(self.keys)))):
+            self.merge()
+        self.refresh_top(keys)
+
+    def merge(self):
+        """Move the side level into the main sorted arrays."""
+        if not len(self.fresh_keys):
+            return
+        self.keys, self.counts, _ = self.add_sorted(self.keys, self.counts, self.fresh_keys, self.fresh_counts)
+        self.fresh_keys = np.empty(0, dtype=np.int64)
+        self.fresh_counts = np.empty(0, dtype=np.uint32)
+
+    def flush(self):
+        """Count buffered increments and merge every pair into the main arrays (keys, counts)."""
+        self.stage()
+        self.merge()
+
+    def prune(self):
+        """Drop the least frequent pairs until at most half of max_pairs remain, then fix the affected top-k rows."""
+        self.merge()
+        target = self.max_pairs // 2
+        keep = np.sort(np.argpartition(self.counts, len(self.counts) - target)[len(self.counts) - target:])
+        dropped = np.ones(len(self.keys), dtype=bool)
+        dropped[keep] = False
+        rows = np.unique(self.keys[dropped] >> 32)
+        self.keys, self.counts = self.keys[keep], self.counts[keep]
+        # Counts only grow between prunes, but here cached neighbors vanish: rebuild those rows from scratch
+        rows = rows[rows < len(self.top)]
+        self.top[rows] = -1
+        self.refresh_top(self.keys[np.isin(self.keys >> 32, rows)])
+
+    def count(self, keys):
+        """Current counts for keys (0 where absent)."""
+        total = np.zeros(len(keys), dtype=np.int64)
+        for stored, counts in ((self.keys, self.counts), (self.fresh_keys, self.fresh_counts)):
+            if len(stored):
+                pos = np.minimum(np.searchsorted(stored, keys), len(stored) - 1)
+                total += np.where(stored[pos] == keys, counts[pos], 0)
+        return total
+
+    def refresh_top(self, touched):
+        if len(self.top) < len(self.vocab):
+            grown = np.full((len(self.vocab), self.k), -1, dtype=np.int64)
+            grown[:len(self.top)] = self.top
+            self.top = grown
+        rows = np.unique(touched >> 32)
+        cached = self.top[rows]
+        cached_rows = np.repeat(rows, self.k)[cached.ravel() >= 0]
+        cached_cols = cached.ravel()[cached.ravel() >= 0]
+        candidates = np.unique(np.concatenate((touched, (cached_rows << 32) | cached_cols)))
+        counts = self.count(candidates)
+        candidates, counts = candidates[counts > 0], counts[counts > 0]
+
+        row_of = candidates >> 32
+        order = np.lexsort((candidates, -counts, row_of))
+        candidates, row_of = candidates[order], row_of[order]
+        starts = np.searchsorted(row_of, rows)
+        rank = np.arange(len(row_of)) - np.repeat(starts, np.diff(np.append(starts, len(row_of))))
+        best = rank < self.k
+        self.top[rows] = -1
+        self.top[row_of[best], rank[best]] = candidates[best] & 0xFFFFFFFF
+
+    def neighbors(self, word, k=None):
+        """The k (at most the cached k) words most often next to word, most frequent first."""
+        self.stage()
+        word_id = self.vocab.lookup(word)
+        if word_id < 0 or word_id >= len(self.top):
+            return []
+        return [self.vocab.words[i] for i in self.top[word_id][:k or self.k] if i >= 0]
+
+    def row(self, word):
+        """All (word, count) pairs co-occurring with word."""
+        self.stage()
+        word_id = self.vocab.lookup(word)
+        if word_id < 0:
+            return {}
+        pairs = {}
+        for stored, counts in ((self.keys, self.counts), (self.fresh_keys, self.fresh_counts)):
+            lo, hi = np.searchsorted(stored, [word_id << 32, (word_id + 1) << 32])
+            pairs.update(zip((stored[lo:hi] & 0xFFFFFFFF).tolist(), counts[lo:hi].tolist()))
+        return {self.vocab.words[j]: pairs[j] for j in sorted(pairs)}
+
+    def __contains__(self, word):
+        return self.vocab.lookup(word) >= 0
+
+    def resize(self, max_pairs):
+        self.max_pairs = max_pairs
+        self.flush()
+        if len(self.keys) > max_pairs:
+            self.prune()
+
+    def ingest_corpus(self, path, chunk_size=CHUNK_SIZE):
+        """
+        Stream a text file in chunks of chunk_size characters. A word split by a chunk
+        boundary is carried into the next chunk, and the last word of each chunk is
+        linked to the first word of the next, so results match one pass over the file.
+        """
+        carry = ""
+        previous = -1
+        with open(path, encoding="utf-8", errors="replace") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                text = carry + chunk
+                if chunk:
+                    # Words are far shorter than this window, and it keeps the search O(1)
+                    window = max(0, len(text) - 1024)
+                    tail = TRAILING_WORD_RE.search(text, window)
+                    if tail and tail.start() == window and window:
+                        tail = TRAILING_WORD_RE.search(text)  # The word may start before the window
+                    carry = tail.group(0) if tail else ""
+                    text = text[:tail.start()] if tail else text
+                previous = self.update(TOKEN_RE.findall(text), previous)
+                if not chunk:
+                    break
+        self.flush()
+
+    def to_dict(self):
+        self.flush()
+        return {word: self.row(word) for word in self.vocab.words}
+
+
+# Self-test block
+if __name__ == "__main__":
+    import os
+    import random
+    import tempfile
+    import time
+
+    # Chunked ingestion matches one pass, including chunks that end right after a newline
+    random.seed(0)
+    lines = [" ".join(random.choice(["alpha", "beta", "gamma", "delta", "x", "yz"]) for _ in range(random.randint(1, 6)))
+             for _ in range(300)]
+    text = "\n".join(lines) + "\n"
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write(text)
+    try:
+        whole = CooccurrenceMatrix()
+        whole.update(TOKEN_RE.findall(text))
+        expected = whole.to_dict()
+        newline_ends = [i + 1 for i, c in enumerate(text) if c == "\n"][:20]
+        for chunk_size in [1, 2, 3, 5, 7, 64, len(text)] + newline_ends:
+            chunked = CooccurrenceMatrix()
+            chunked.ingest_corpus(f.name, chunk_size)
+            assert chunked.vocab.words == whole.vocab.words, (chunk_size, chunked.vocab.words)
+            assert chunked.to_dict() == expected, chunk_size
+    finally:
+        os.unlink(f.name)
+    print("Chunked ingestion matches one pass for every chunk size tried.")
+
+    # Interleaved updates and queries agree with counting from scratch
+    matrix = CooccurrenceMatrix(max_pairs=1 << 30)
+    words = [f"w{i}" for i in range(5000)]
+    stream = [random.choice(words) for _ in range(200000)]
+    for i in range(0, len(stream), 100):
+        matrix.update(stream[i:i + 100], matrix.vocab.lookup(stream[i - 1]) if i else -1)
+        if i % 5000 == 0:
+            matrix.neighbors(random.choice(words))
+    reference = CooccurrenceMatrix(max_pairs=1 << 30)
+    reference.update(stream)
+    reference.flush()
+    for word in random.sample(words, 200):
+        assert matrix.row(word) == reference.row(word), word
+        assert matrix.neighbors(word) == reference.neighbors(word), word
+    print("Interleaved updates and queries match a single batch update.")
+
+    # After pruning, cached neighbors are exactly the top of the surviving pairs
+    pruned = CooccurrenceMatrix(max_pairs=2000)
+    for i in range(0, 50000, 100):
+        pruned.update(stream[i:i + 100])
+        if i % 5000 == 0:
+            pruned.neighbors(random.choice(words))
+    pruned.flush()
+    assert len(pruned.keys) <= 2000
+    for word in words[:500]:
+        ranked = sorted(pruned.row(word).items(), key=lambda item: (-item[1], pruned.vocab.lookup(item[0])))
+        assert pruned.neighbors(word) == [w for w, _ in ranked[:pruned.k]], word
+    print("Pruning keeps the cached neighbors consistent with the stored pairs.")
+
+    # Query cost with a large stored matrix and one new message per query
+    matrix.flush()
+    start = time.perf_counter()
+    for _ in range(1000):
+        matrix.update(random.sample(words, 10))
+        matrix.neighbors(random.choice(words))
+    elapsed = (time.perf_counter() - start) / 1000
+    print(f"{len(matrix.keys)} stored pairs: {elapsed * 1e6:.0f} us per update + neighbors query")
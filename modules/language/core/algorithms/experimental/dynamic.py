@@ -1,25 +1,102 @@
 import re
-from collections import Counter, defaultdict
+from collections import Counter, deque
+from modules.language.core.algorithms.experimental.bounded import LRUDict, SpaceSaving
+from modules.language.core.algorithms.experimental.cooccurrence import CooccurrenceMatrix
+from modules.language.core.algorithms.experimental.lexicon import Lexicon, covered
+
+# Memory caps for the global stores, change them with set_limits()
+limits = {
+    "history": 1000,  # Messages kept in conversation_history
+    "entities": 10000,  # Entities counted in entity_memory (least frequent evicted)
+    "relationships": 10000,  # Entities with tracked relationships (least recent evicted)
+    "labels": 1000,  # Classification labels (least recent evicted)
+    "examples": 100,  # Texts kept per classification label
+    "phrases": 10000,  # Keyword phrases learned by refine_classification (least recent evicted)
+    "cooccurrence": 1000000,  # Word pairs in word_cooccurrence (least frequent pruned)
+    "vocabulary": 1000000,  # Distinct words word_cooccurrence will intern
+    "patterns": 10000,  # Patterns counted in patterns (least frequent evicted)
+}
 
 # Global variables for dynamic learning and context tracking
-conversation_history = []  # Stores the history of interactions
+conversation_history = deque(maxlen=limits["history"])  # Stores the history of interactions
 sentiment_dict = {"happy": 1, "sad": -1, "great": 2, "terrible": -2}  # Dynamic sentiment dictionary
-entity_memory = defaultdict(int)  # Tracks entities and their frequencies
-entity_relationships = defaultdict(set)  # Tracks relationships between entities
-classification_labels = defaultdict(list)  # Stores user-provided labels for text classification
-word_cooccurrence = defaultdict(Counter)  # Tracks word co-occurrence statistics
-patterns = defaultdict(int)  # Tracks recognized patterns in user inputs
+entity_memory = SpaceSaving(limits["entities"])  # Tracks entities and their frequencies
+entity_relationships = LRUDict(limits["relationships"], set)  # Tracks relationships between entities
+classification_labels = LRUDict(limits["labels"], lambda: deque(maxlen=limits["examples"]))  # Stores user-provided labels for text classification
+word_cooccurrence = CooccurrenceMatrix(3, limits["cooccurrence"], limits["vocabulary"])  # Tracks word co-occurrence statistics
+patterns = SpaceSaving(limits["patterns"])  # Tracks recognized patterns in user inputs
+
+# Keyword lists for classify_text and entity gazetteers for classify_entities (terms may be phrases)
+text_categories = {"sports": ["game", "team", "score"], "politics": ["vote", "election", "policy"]}
+entity_categories = {"Person": ["John", "Mary"], "Location": ["Paris", "London"], "Organization": ["Google", "Microsoft"]}
+
+# Every sentiment word, negation, stopword, entity and keyword, matched in one scan per message
+lexicon = Lexicon()
+
+def forget_phrase(key, text):
+    """Drop a learned keyword phrase evicted from learned_phrases from text_categories and the lexicon."""
+    words, label = key
+    keywords = text_categories.get(label, [])
+    if text in keywords:
+        keywords.remove(text)
+        if not keywords:
+            del text_categories[label]
+    categories = tuple(category for category in lexicon.get(words, "keyword", ()) if category != label)
+    if categories:
+        lexicon.add(words, "keyword", categories)
+    else:
+        lexicon.remove(words, "keyword")
+
+learned_phrases = LRUDict(limits["phrases"], on_evict=forget_phrase)  # (phrase tokens, label) -> text
+
+def index_keywords():
+    """Rebuild the lexicon's keyword -> categories entries from text_categories."""
+    lexicon.clear("keyword")
+    for category, keywords in text_categories.items():
+        for term in keywords:
+            lexicon.add(term, "keyword", lexicon.get(term, "keyword", ()) + (category,))
+
+def build_lexicon():
+    """Rebuild the whole lexicon from sentiment_dict, NEGATIONS, STOPWORDS, entity_categories and text_categories."""
+    lexicon.clear()
+    lexicon.update(sentiment_dict, "sentiment")
+    lexicon.update(NEGATIONS, "negation")
+    lexicon.update(STOPWORDS, "stopword")
+    for category, names in entity_categories.items():
+        for name in names:
+            lexicon.add(name, "entity", category)
+    index_keywords()
+
+def set_limits(**caps):
+    """Change memory caps (see limits); stores shrink right away, evicting as they would on insert."""
+    global conversation_history
+    limits.update(caps)
+    conversation_history = deque(conversation_history, maxlen=limits["history"])
+    entity_memory.resize(limits["entities"])
+    entity_relationships.resize(limits["relationships"])
+    classification_labels.resize(limits["labels"])
+    learned_phrases.resize(limits["phrases"])
+    word_cooccurrence.resize(limits["cooccurrence"])
+    word_cooccurrence.vocab.max_words = limits["vocabulary"]
+    patterns.resize(limits["patterns"])
+
+TOKEN_RE = re.compile(r'\b\w+\b')
+ENTITY_RE = re.compile(r'[A-Z][a-z]*')
+STOPWORDS = frozenset({"the", "and", "is", "in", "on", "at", "of", "a", "an"})
+NEGATIONS = frozenset({"not", "no"})
+NEGATION_SCOPE = None  # Tokens after a negation it can still flip; None reaches the next sentiment term
 
 # 1. Text Preprocessing
 def tokenize(text):
     """Split text into words."""
-    return re.findall(r'\b\w+\b', text)
+    return TOKEN_RE.findall(text)
 
 def remove_stopwords(tokens, stopwords=None):
     """Remove common stopwords from tokens."""
-    if stopwords is None:
-        stopwords = {"the", "and", "is", "in", "on", "at", "of", "a", "an"}
-    return [word for word in tokens if word.lower() not in stopwords]
+    if stopwords is not None:
+        return [word for word in tokens if word.lower() not in stopwords]
+    stopped = covered(lexicon.scan([word.lower() for word in tokens]).get("stopword", ()))
+    return [word for i, word in enumerate(tokens) if i not in stopped]
 
 def stem(word):
     """Simplistic stemming function."""
@@ -59,47 +136,65 @@ def word_similarity(word1, word2):
 
 def update_word_cooccurrence(tokens):
     """Update word co-occurrence matrix based on tokens."""
-    for i, word in enumerate(tokens):
-        for related_word in tokens[max(0, i - 1):i + 2]:
-            if word != related_word:
-                word_cooccurrence[word][related_word] += 1
+    word_cooccurrence.update(tokens)
 
 def find_synonyms(word):
     """Find potential synonyms based on co-occurrence patterns."""
-    if word in word_cooccurrence:
-        return [related_word for related_word, count in word_cooccurrence[word].most_common(3)]
-    return []
+    return word_cooccurrence.neighbors(word, 3)
+
+def ingest_corpus(path):
+    """Build co-occurrence statistics from a large text file, streamed in chunks."""
+    word_cooccurrence.ingest_corpus(path)
 
 # 4. Pattern Recognition
 def recognize_patterns(text):
     """Identify and track recurring patterns in user inputs."""
-    tokens = tokenize(text)
+    recognize_token_patterns(tokenize(text))
+
+def recognize_token_patterns(tokens):
+    """Track recurring patterns from an already tokenized input."""
     for i in range(len(tokens) - 1):
         pattern = f"{tokens[i]} {tokens[i + 1]}"
-        patterns[pattern] += 1
+        patterns.add(pattern)
 
 def get_common_patterns():
     """Retrieve the most common patterns."""
-    return sorted(patterns.items(), key=lambda x: x[1], reverse=True)[:5]
+    return patterns.top(5)
 
 # 5. Named Entity Recognition (NER)
 def extract_entities(text):
     """Extract capitalized words as potential entities."""
-    entities = re.findall(r'\b[A-Z][a-z]*\b', text)
+    return extract_token_entities(tokenize(text))
+
+def extract_token_entities(tokens):
+    """Extract entities from tokens; a token is one exactly when it is a capitalized ASCII word."""
+    entities = [word for word in tokens if ENTITY_RE.fullmatch(word)]
     for entity in entities:
-        entity_memory[entity] += 1  # Update entity memory dynamically
+        entity_memory.add(entity)  # Update entity memory dynamically
     return entities
 
 def classify_entities(entities):
-    """Classify entities into categories."""
-    categories = {"Person": ["John", "Mary"], "Location": ["Paris", "London"], "Organization": ["Google", "Microsoft"]}
+    """Classify entities into categories; like classify_token_entities, only names whose first word is capitalized count."""
     classified = {}
     for entity in entities:
-        for category, examples in categories.items():
-            if entity in examples:
-                classified[entity] = category
+        words = entity.split()
+        if not words or not ENTITY_RE.fullmatch(words[0]):
+            continue  # The lexicon ignores case, so "paris" would otherwise match "Paris"
+        category = lexicon.get(entity, "entity")
+        if category is not None:
+            classified[entity] = category
     return classified
 
+def classify_token_entities(tokens, matches):
+    """Classify gazetteer phrases found by a lexicon scan; a phrase counts when its first word is an entity."""
+    return {" ".join(tokens[start:end]): category for start, end, category in matches.get("entity", ())
+            if ENTITY_RE.fullmatch(tokens[start])}
+
+def add_entity(entity, category):
+    """Add a name or multi-word phrase to the entity gazetteer."""
+    entity_categories.setdefault(category, []).append(entity)
+    lexicon.add(entity, "entity", category)
+
 def update_entity_relationships(entities):
     """Track relationships between entities based on proximity."""
     for i, entity in enumerate(entities):
@@ -110,24 +205,42 @@ def update_entity_relationships(entities):
 # 6. Sentiment Analysis
 def sentiment_analysis(tokens):
     """Basic sentiment analysis using dynamic sentiment dictionary."""
-    return sum(sentiment_dict.get(word.lower(), 0) for word in tokens)
+    found = lexicon.scan([word.lower() for word in tokens])
+    return sum(score for _, _, score in found.get("sentiment", ()))
 
 def update_sentiment_dict(word, score):
-    """Update the sentiment dictionary dynamically."""
+    """Update the sentiment dictionary dynamically; word may be a phrase."""
     sentiment_dict[word.lower()] = score
+    lexicon.add(word, "sentiment", score)
 
 def contextual_sentiment_analysis(text):
     """Analyze sentiment with context (e.g., handling negations)."""
-    tokens = tokenize(text)
+    return token_sentiment([word.lower() for word in tokenize(text)])
+
+def token_sentiment(lowered, matches=None):
+    """
+    Contextual sentiment of already lowercased tokens.
+
+    A negation flips the next sentiment term within NEGATION_SCOPE tokens.
+    Negations inside a sentiment phrase (such as "not bad") belong to the
+    phrase. Pass matches to reuse a lexicon scan of the same tokens.
+    """
+    if matches is None:
+        matches = lexicon.scan(lowered)
+    terms = matches.get("sentiment", ())
+    inside = covered(terms)
+    negations = [end for start, end, _ in matches.get("negation", ()) if start not in inside]
     score = 0
-    negation = False
-    for word in tokens:
-        if word.lower() in {"not", "no"}:
-            negation = True
-        elif word.lower() in sentiment_dict:
-            sentiment = sentiment_dict[word.lower()]
-            score += -sentiment if negation else sentiment
-            negation = False
+    negated = None  # End of the negation waiting for a sentiment term
+    i = 0
+    for start, _, sentiment in terms:
+        while i < len(negations) and negations[i] <= start:
+            negated = negations[i]
+            i += 1
+        if negated is not None and (NEGATION_SCOPE is None or start - negated < NEGATION_SCOPE):
+            sentiment = -sentiment
+        score += sentiment
+        negated = None
     return score
 
 # 7. Text Summarization
@@ -150,14 +263,36 @@ def resolve_coreference(pronoun):
 # 9. Advanced NLP Tasks
 def classify_text(text):
     """Classify text into predefined categories."""
-    categories = {"sports": ["game", "team", "score"], "politics": ["vote", "election", "policy"]}
-    tokens = tokenize(text)
-    scores = {category: sum(tokens.count(word) for word in keywords) for category, keywords in categories.items()}
+    return classify_tokens(tokenize(text))
+
+def classify_tokens(tokens, matches=None):
+    """Classify already tokenized text by its keyword matches; pass matches to reuse a lexicon scan."""
+    if matches is None:
+        matches = lexicon.scan([word.lower() for word in tokens])
+    scores = dict.fromkeys(text_categories, 0)
+    for _, _, categories in matches.get("keyword", ()):
+        for category in categories:
+            scores[category] += 1
     return max(scores, key=scores.get)
 
 def refine_classification(text, label):
-    """Allow users to refine classification by providing labels."""
+    """
+    Allow users to refine classification by providing labels; the text becomes a keyword phrase of label.
+
+    At most limits["phrases"] learned phrases are kept, the least recently refined one is forgotten first.
+    """
     classification_labels[label].append(text)
+    words = lexicon.key(text)
+    key = (words, label)
+    if key in learned_phrases:
+        learned_phrases[key] = learned_phrases[key]  # Refresh
+        return
+    categories = lexicon.get(words, "keyword", ())
+    if not words or label in categories:
+        return  # Not a phrase, or already a keyword of label
+    text_categories.setdefault(label, []).append(text)
+    lexicon.add(words, "keyword", categories + (label,))
+    learned_phrases[key] = text
 
 def topic_modeling(text):
     """Identify topics based on word frequency."""
@@ -167,12 +302,79 @@ def topic_modeling(text):
 
 def generate_response(text):
     """Generate a simple response based on input text."""
-    if "hello" in text.lower():
+    lowered = text.lower()
+    if "hello" in lowered:
         return "Hi there! How can I help you?"
-    elif "bye" in text.lower():
+    elif "bye" in lowered:
         return "Goodbye! Have a great day!"
     return "I'm here to assist you."
 
+# 10. Fused Pipeline
+def word_info(word, cache):
+    """Per-word work (lowercase, stem), done once per distinct word in cache."""
+    info = cache.get(word)
+    if info is None:
+        info = cache[word] = (word.lower(), stem(word))
+    return info
+
+def analyze_message(text, cache=None):
+    """
+    Run every per-message analysis of the interactive loop from a single tokenization.
+
+    The message is tokenized once and each word is lowercased once; one lexicon
+    scan finds its stopwords, sentiment terms, negations, entities and keywords,
+    and all analyzers read those. Pass the same cache dict across calls to also
+    share per-word work between messages.
+    """
+    if cache is None:
+        cache = {}
+    add_to_history(text)
+    tokens = tokenize(text)
+    infos = [word_info(word, cache) for word in tokens]
+    lowered = [info[0] for info in infos]
+    matches = lexicon.scan(lowered)
+    stopped = covered(matches.get("stopword", ()))
+    filtered = [word for i, word in enumerate(tokens) if i not in stopped]
+    stemmed = [info[1] for i, info in enumerate(infos) if i not in stopped]
+    counts = Counter(tokens)
+
+    entities = extract_token_entities(tokens)
+    update_entity_relationships(entities)
+    update_word_cooccurrence(tokens)
+    recognize_token_patterns(tokens)
+    return {
+        "tokens": tokens,
+        "filtered": filtered,
+        "stemmed": stemmed,
+        "entities": entities,
+        "classified_entities": classify_token_entities(tokens, matches),
+        "sentiment": token_sentiment(lowered, matches),
+        "summary": [word for word, _ in counts.most_common(5)],
+        "classification": classify_tokens(tokens, matches),
+        "topics": counts.most_common(3),
+        "response": generate_response(text),
+    }
+
+def analyze_messages(messages):
+    """Analyze a batch of messages, sharing per-word work across the whole batch."""
+    cache = {}
+    return [analyze_message(text, cache) for text in messages]
+
+def analyze_corpus(path, batch_size=1000):
+    """Stream a corpus file, one message per non-empty line, yielding analyses in batches."""
+    with open(path, encoding="utf-8") as f:
+        batch = []
+        for line in f:
+            line = line.strip()
+            if line:
+                batch.append(line)
+            if len(batch) >= batch_size:
+                yield from analyze_messages(batch)
+                batch = []
+        yield from analyze_messages(batch)
+
+build_lexicon()
+
 # Example Usage
 if __name__ == "__main__":
     print("Welcome to the NLP system! Type 'exit' to quit.")
@@ -182,40 +384,23 @@ if __name__ == "__main__":
             print("Goodbye!")
             break
 
-        # Add input to conversation history
-        add_to_history(user_input)
-
-        # Tokenize and preprocess
-        tokens = tokenize(user_input)
-        filtered_tokens = remove_stopwords(tokens)
-        stemmed_tokens = stem_tokens(filtered_tokens)
-
-        # Perform NLP tasks
-        entities = extract_entities(user_input)
-        classified_entities = classify_entities(entities)
-        update_entity_relationships(entities)
-        update_word_cooccurrence(tokens)
-        recognize_patterns(user_input)
-        sentiment = contextual_sentiment_analysis(user_input)
-        summary = summarize(user_input)
-        classification = classify_text(user_input)
-        topics = topic_modeling(user_input)
-        response = generate_response(user_input)
+        # Analyze the message from a single tokenization
+        analysis = analyze_message(user_input)
 
         # Display results
-        print("Tokens:", tokens)
-        print("Filtered Tokens:", filtered_tokens)
-        print("Stemmed Tokens:", stemmed_tokens)
-        print("Entities:", entities)
-        print("Classified Entities:", classified_entities)
+        print("Tokens:", analysis["tokens"])
+        print("Filtered Tokens:", analysis["filtered"])
+        print("Stemmed Tokens:", analysis["stemmed"])
+        print("Entities:", analysis["entities"])
+        print("Classified Entities:", analysis["classified_entities"])
         print("Entity Relationships:", dict(entity_relationships))
-        print("Word Co-occurrence:", dict(word_cooccurrence))
+        print("Word Co-occurrence:", word_cooccurrence.to_dict())
         print("Recognized Patterns:", get_common_patterns())
-        print("Sentiment Score:", sentiment)
-        print("Summary:", summary)
-        print("Classification:", classification)
-        print("Topics:", topics)
-        print("Response:", response)
+        print("Sentiment Score:", analysis["sentiment"])
+        print("Summary:", analysis["summary"])
+        print("Classification:", analysis["classification"])
+        print("Topics:", analysis["topics"])
+        print("Response:", analysis["response"])
 
         # Example of dynamic learning
         print("Dynamic Learning: Add a sentiment word (type 'word score') or refine classification (type 'label text') or press Enter to continue.")
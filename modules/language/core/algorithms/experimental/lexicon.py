@@ -0,0 +1,172 @@
+import re
+from collections import Counter
+
+TOKEN_RE = re.compile(r'\b\w+\b')
+VALUES = None  # Key under which a trie node keeps the values of the term ending there
+
+class Lexicon:
+    """
+    A trie over lowercased tokens. Each entry is a term of one or more words, with one value per kind.
+
+    scan() walks the trie from every token of a message and reports the
+    leftmost-longest matches of each kind. Its cost depends on the message
+    length and the longest term, never on how many terms there are. Adding or
+    removing a term only touches the nodes along its tokens, so lexicons of
+    any size are loaded and extended incrementally, without a rebuild.
+    """
+
+    def __init__(self):
+        self.root = {}
+        self.sizes = Counter()  # Terms per kind
+
+    def __len__(self):
+        return sum(self.sizes.values())
+
+    @staticmethod
+    def key(term):
+        """The lowercased tokens of a term given as text or as a token sequence."""
+        if isinstance(term, str):
+            return tuple(TOKEN_RE.findall(term.lower()))
+        return tuple(word.lower() for word in term)
+
+    def add(self, term, kind, value=True):
+        """Set the value of term for kind; terms without tokens are ignored."""
+        words = self.key(term)
+        if not words:
+            return
+        node = self.root
+        for word in words:
+            node = node.setdefault(word, {})
+        values = node.setdefault(VALUES, {})
+        if kind not in values:
+            self.sizes[kind] += 1
+        values[kind] = value
+
+    def update(self, terms, kind):
+        """Add many terms of one kind, from a {term: value} mapping or an iterable of terms."""
+        items = terms.items() if hasattr(terms, "items") else ((term, True) for term in terms)
+        for term, value in items:
+            self.add(term, kind, value)
+
+    def get(self, term, kind, default=None):
+        node = self.root
+        for word in self.key(term):
+            node = node.get(word)
+            if node is None:
+                return default
+        return node.get(VALUES, {}).get(kind, default)
+
+    def remove(self, term, kind):
+        """Drop the value of term for kind and prune nodes left empty."""
+        words = self.key(term)
+        path = [self.root]
+        for word in words:
+            node = path[-1].get(word)
+            if node is None:
+                return
+            path.append(node)
+        values = path[-1].get(VALUES)
+        if not values or kind not in values:
+            return
+        del values[kind]
+        self.sizes[kind] -= 1
+        if not values:
+            del path[-1][VALUES]
+        for i in range(len(words), 0, -1):
+            if path[i]:
+                break
+            del path[i - 1][words[i - 1]]
+
+    def clear(self, kind=None):
+        """Drop every term of kind, or everything if kind is None."""
+        if kind is None:
+            self.root = {}
+            self.sizes.clear()
+            return
+        def prune(node):
+            """Drop kind below node; True if node is left empty. Recursion is as deep as the longest term."""
+            values = node.get(VALUES)
+            if values and kind in values:
+                del values[kind]
+                if not values:
+                    del node[VALUES]
+            for word in [word for word in node if word is not VALUES]:
+                if prune(node[word]):
+                    del node[word]
+            return not node
+
+        prune(self.root)
+        self.sizes.pop(kind, None)
+
+    def scan(self, lowered):
+        """
+        Find the terms in a message.
+
+        Args:
+            lowered (list[str]): The message's lowercased tokens.
+
+        Returns:
+            dict[str, list[tuple[int, int, object]]]: Per kind, its (start, end, value) matches in
+            token order. Matches of one kind never overlap: at each token the longest term wins,
+            and tokens inside a match do not start another of the same kind.
+        """
+        matches = {}
+        reach = {}  # Per kind, the end of its last match
+        root = self.root
+        size = len(lowered)
+        for start in range(size):
+            node = root.get(lowered[start])
+            end = start
+            longest = {}
+            while node is not None:
+                end += 1
+                values = node.get(VALUES)
+                if values:
+                    for kind, value in values.items():
+                        longest[kind] = (end, value)
+                node = node.get(lowered[end]) if end < size else None
+            for kind, (stop, value) in longest.items():
+                if reach.get(kind, 0) <= start:
+                    matches.setdefault(kind, []).append((start, stop, value))
+                    reach[kind] = stop
+        return matches
+
+def covered(found):
+    """Token positions inside any of the (start, end, value) matches."""
+    return {i for start, end, _ in found for i in range(start, end)}
+
+
+# Self-test block
+if __name__ == "__main__":
+    import random
+    import time
+
+    lexicon = Lexicon()
+    lexicon.update({"good": 1, "not bad": 1, "bad": -1}, "sentiment")
+    lexicon.update(["new york", "york"], "entity")
+    lexicon.add("new", "sentiment", 2)
+    found = lexicon.scan("not bad in new york is good not".split())
+    assert found["sentiment"] == [(0, 2, 1), (3, 4, 2), (6, 7, 1)], found
+    assert found["entity"] == [(3, 5, True)], found
+    lexicon.remove("new york", "entity")
+    assert lexicon.get("new york", "entity") is None and lexicon.get("York", "entity") is True
+    assert lexicon.scan(["new", "york"])["entity"] == [(1, 2, True)]
+    lexicon.clear("sentiment")
+    assert lexicon.sizes == {"entity": 1} and len(lexicon.root) == 1, lexicon.root
+    print("Lexicon matches, removes and clears as expected.")
+
+    # Per-message cost against lexicon size, with the same terms occurring in the message each time
+    random.seed(0)
+    common = [f"t{i}" for i in range(100)]
+    message = [random.choice(common) if random.random() < 0.05 else f"w{random.randrange(100000)}"
+               for _ in range(10000)]
+    lexicon = Lexicon()
+    lexicon.update(common, "term")
+    for size in (1000, 10000, 100000, 1000000):
+        while len(lexicon) < size:
+            lexicon.add([f"t{random.randrange(100, 10 ** 7)}" for _ in range(random.randint(1, 3))], "term")
+        start = time.perf_counter()
+        for _ in range(10):
+            lexicon.scan(message)
+        elapsed = (time.perf_counter() - start) / 10
+        print(f"{size:7} terms: {len(message) / elapsed / 1e6:.2f} M tokens/s")
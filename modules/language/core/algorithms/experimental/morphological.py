@@ -1,4 +1,5 @@
 import random
+import numpy as np
 
 # Define basic operators and expectations
 allowed_ops = [
@@ -16,6 +17,10 @@ expectations = [
     ("z < 128", lambda z: z < 128),
 ]
 
+op_funcs = dict(allowed_ops)
+op_ids = {label: i for i, (label, _) in enumerate(allowed_ops)}
+exp_ids = {label: i for i, (label, _) in enumerate(expectations)}
+
 # Observed triplets (x, y → z)
 observed = [
     (5, 3, 8),
@@ -68,7 +73,7 @@ def mutate_rule(rule):
     if choice == "target_shift":
         delta = random.choice([-8, -4, 4, 8])
         new_target = max(0, min(255, new["target"] + delta))
-        op_func = dict(allowed_ops)[new["op_label"]]
+        op_func = op_funcs[new["op_label"]]
         new["target"] = new_target
         new["if"] = make_if(op_func, new_target)
     elif choice == "expectation_change":
@@ -94,14 +99,158 @@ def evolve(rules):
     mutated = [mutate_rule(r) for r in survivors if random.random() < 0.3]
     return compress_rules(survivors + mutated)
 
+# Compiled rules: structure of arrays, one entry per rule
+class RuleArrays:
+    def __init__(self, op, target, exp, strength=None):
+        self.op = np.asarray(op, dtype=np.uint8)  # Index into allowed_ops
+        self.target = np.asarray(target, dtype=np.uint8)
+        self.exp = np.asarray(exp, dtype=np.uint8)  # Index into expectations
+        self.strength = np.full(len(self.op), 128, dtype=np.uint8) if strength is None else np.asarray(strength, dtype=np.uint8)
+
+    def __len__(self):
+        return len(self.op)
+
+    def take(self, index):
+        return RuleArrays(self.op[index], self.target[index], self.exp[index], self.strength[index])
+
+    @classmethod
+    def from_rules(cls, rules):
+        return cls([op_ids[r["op_label"]] for r in rules], [r["target"] for r in rules],
+                   [exp_ids[r["exp_label"]] for r in rules], [r["strength"] for r in rules])
+
+    def to_rules(self):
+        rules = []
+        for op, target, exp, strength in zip(self.op.tolist(), self.target.tolist(), self.exp.tolist(), self.strength.tolist()):
+            op_label, op_func = allowed_ops[op]
+            exp_label, exp_func = expectations[exp]
+            rules.append({
+                "op_label": op_label,
+                "target": target,
+                "exp_label": exp_label,
+                "if": make_if(op_func, target),
+                "then": make_then(exp_func),
+                "strength": strength
+            })
+        return rules
+
+def generate_rule_arrays():
+    op, exp, target = np.meshgrid(np.arange(len(allowed_ops)), np.arange(len(expectations)),
+                                  np.arange(0, 256, 16), indexing="ij")
+    return RuleArrays(op.ravel(), target.ravel(), exp.ravel())
+
+# Observations bucketed by what each operator makes of them. A rule
+# "op(x, y) == target -> exp(z)" only ever sees the observations in bucket
+# (op, target), so storing per bucket how many observations there are and
+# how many pass each expectation makes every rule's score a lookup:
+# hits - misses = 2 * passed - total. Adding observations only touches
+# their own buckets, so the index can grow without rescanning history.
+class ObservationIndex:
+    def __init__(self, observed=()):
+        self.total = np.zeros((len(allowed_ops), 256), dtype=np.int64)
+        self.passed = np.zeros((len(allowed_ops), len(expectations), 256), dtype=np.int64)
+        self.size = 0
+        self.add(observed)
+
+    def add(self, observed):
+        """Index new (x, y, z) triplets; returns the score table of just these triplets."""
+        total = np.zeros_like(self.total)
+        passed = np.zeros_like(self.passed)
+        triplets = np.asarray(observed, dtype=np.int64).reshape(-1, 3)
+        if len(triplets):
+            x, y, z = triplets.T
+            outcomes = [np.asarray(exp(z), dtype=bool) for _, exp in expectations]
+            for o, (_, op) in enumerate(allowed_ops):
+                result = op(x, y)
+                valid = (result >= 0) & (result < 256)  # Targets never leave the 8-bit space
+                total[o] = np.bincount(result[valid], minlength=256)
+                for e, outcome in enumerate(outcomes):
+                    passed[o, e] = np.bincount(result[valid & outcome], minlength=256)
+        self.total += total
+        self.passed += passed
+        self.size += len(triplets)
+        return 2 * passed - total[:, None, :]
+
+    def table(self):
+        """Score of every (op, expectation, target) rule against everything indexed."""
+        return 2 * self.passed - self.total[:, None, :]
+
+    def bucket(self, op_label, value):
+        """(observations, passes per expectation label) where the operator gives value."""
+        o = op_ids[op_label]
+        return int(self.total[o, value]), {label: int(n) for (label, _), n in zip(expectations, self.passed[o, :, value])}
+
+    def __len__(self):
+        return self.size
+
+# Score of every possible (op, expectation, target) rule against the observations.
+# The operators and expectations work unchanged on arrays, so this is one
+# op x observation pass; a rule's score is then a single table lookup.
+def score_table(observed):
+    return ObservationIndex(observed).table()
+
+# evaluate_rules with every rule scored by lookup instead of a scan of observed
+def evaluate_rules_indexed(rules, table):
+    for rule in rules:
+        score = int(table[op_ids[rule["op_label"]], exp_ids[rule["exp_label"]], rule["target"]])
+        rule["strength"] = max(0, min(255, rule["strength"] + score))
+    return rules
+
+def evaluate_rule_arrays(arrays, observed, table=None):
+    if table is None:
+        table = score_table(observed)
+    score = table[arrays.op, arrays.exp, arrays.target]
+    arrays.strength = np.clip(arrays.strength.astype(np.int64) + score, 0, 255).astype(np.uint8)
+    return arrays
+
+def compress_rule_arrays(arrays):
+    key = (arrays.op.astype(np.int64) * len(expectations) + arrays.exp) * 256 + arrays.target
+    _, first = np.unique(key, return_index=True)
+    return arrays.take(np.sort(first))
+
+def mutate_arrays(arrays, rng=None):
+    """Survivors (strength >= 32) and their mutants, which start unscored at 128."""
+    rng = rng or np.random.default_rng()
+    survivors = arrays.take(arrays.strength >= 32)
+    mutated = survivors.take(rng.random(len(survivors)) < 0.3)
+    shift = rng.random(len(mutated)) < 0.5  # target_shift, otherwise expectation_change
+    deltas = rng.choice(np.array([-8, -4, 4, 8]), len(mutated))
+    targets = np.where(shift, np.clip(mutated.target.astype(np.int64) + deltas, 0, 255), mutated.target)
+    exps = np.where(shift, mutated.exp, rng.integers(0, len(expectations), len(mutated)))
+    return survivors, RuleArrays(mutated.op, targets, exps)
+
+def combine_rule_arrays(survivors, mutated):
+    return compress_rule_arrays(RuleArrays(np.concatenate((survivors.op, mutated.op)),
+                                           np.concatenate((survivors.target, mutated.target)),
+                                           np.concatenate((survivors.exp, mutated.exp)),
+                                           np.concatenate((survivors.strength, mutated.strength))))
+
+def evolve_arrays(arrays, rng=None):
+    return combine_rule_arrays(*mutate_arrays(arrays, rng))
+
+# One generation of a long-running evolution fed with a stream of observations.
+# Every (rule, observation) pair is scored exactly once: rules carried over are
+# scored only on the new observations, mutants once on the whole index. The
+# cost per generation depends on the rule count and the new observations,
+# never on how many observations came before.
+def evolve_incremental(arrays, index, observed=(), rng=None):
+    arrays = evaluate_rule_arrays(arrays, None, index.add(observed))
+    survivors, mutated = mutate_arrays(arrays, rng)
+    mutated = evaluate_rule_arrays(mutated, None, index.table())
+    return combine_rule_arrays(survivors, mutated)
+
 # Run the system
-rules = generate_rules()
-for _ in range(10):  # 10 evolution cycles
-    rules = evaluate_rules(rules, observed)
-    rules = evolve(rules)
-
-# Print top surviving rules
-print("\nTop Surviving Rules:\n")
-top_rules = sorted(rules, key=lambda r: -r["strength"])[:10]
-for r in top_rules:
-    print(f"Strength: {r['strength']:3} | IF ({r['op_label']} == {r['target']}) THEN ({r['exp_label']})")
+def run(cycles=10, observed=observed):
+    rules = generate_rules()
+    for _ in range(cycles):  # Evolution cycles
+        rules = evaluate_rules(rules, observed)
+        rules = evolve(rules)
+
+    # Print top surviving rules
+    print("\nTop Surviving Rules:\n")
+    top_rules = sorted(rules, key=lambda r: -r["strength"])[:10]
+    for r in top_rules:
+        print(f"Strength: {r['strength']:3} | IF ({r['op_label']} == {r['target']}) THEN ({r['exp_label']})")
+    return rules
+
+if __name__ == "__main__":
+    run()
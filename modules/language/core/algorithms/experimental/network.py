@@ -0,0 +1,299 @@
+import numpy as np
+
+class Network:
+    """
+    A whole population of 8-bit neurons stepped at once.
+
+    Every neuron property from neuron.Neuron is stored as one uint8 array over
+    the population, and synapse weights as a uint8 matrix. A step applies the
+    same rules as Neuron.update (saturating Hebbian weights, activation decay,
+    threshold mutation, local data cycling) to every neuron in a few array
+    operations. All neurons read the spike state from the start of the tick,
+    so a step equals calling Neuron.update on each neuron against a snapshot
+    of its neighbors.
+    """
+
+    def __init__(self, num_neurons, neighbors=None):
+        """
+        Initialize the population with the same defaults as Neuron.
+
+        Args:
+            num_neurons (int): Number of neurons in the network.
+            neighbors (array-like | None): (num_neurons, k) neuron indices, row i listing the
+                neighbors of neuron i in weight order. None connects every neuron to every
+                neuron (dense num_neurons x num_neurons weights).
+
+        Attributes:
+            activation, timer, threshold (np.ndarray[uint8]): One entry per neuron.
+            local_data, persistent_storage (np.ndarray[uint8]): (num_neurons, 8) per-neuron bytes.
+            weights (np.ndarray[uint8]): (num_neurons, k) synapse strengths, initialized to 128.
+        """
+        self.size = num_neurons
+        self.neighbors = None if neighbors is None else np.asarray(neighbors, dtype=np.int64)
+        degree = num_neurons if self.neighbors is None else self.neighbors.shape[1]
+        self.activation = np.zeros(num_neurons, dtype=np.uint8)
+        self.timer = np.zeros(num_neurons, dtype=np.uint8)
+        self.weights = np.full((num_neurons, degree), 128, dtype=np.uint8)
+        self.local_data = np.zeros((num_neurons, 8), dtype=np.uint8)
+        self.threshold = np.full(num_neurons, 128, dtype=np.uint8)
+        self.persistent_storage = np.zeros((num_neurons, 8), dtype=np.uint8)
+
+    @classmethod
+    def from_neurons(cls, neurons, neighbors=None):
+        """
+        Build a network holding the current state of existing Neuron objects.
+
+        Args:
+            neurons (list[Neuron]): The population.
+            neighbors (list[list[int]] | None): Neighbor indices per neuron, as in __init__.
+
+        Returns:
+            Network: A network with copies of every neuron's state.
+        """
+        network = cls(len(neurons), neighbors)
+        network.activation[:] = [n.activation for n in neurons]
+        network.timer[:] = [n.timer for n in neurons]
+        network.weights[:] = [list(n.weights) for n in neurons]
+        network.local_data[:] = [n.local_data for n in neurons]
+        network.threshold[:] = [n.threshold for n in neurons]
+        network.persistent_storage[:] = [n.persistent_storage for n in neurons]
+        return network
+
+    def spikes(self):
+        """
+        Returns:
+            np.ndarray[bool]: True for every neuron whose activation exceeds its threshold.
+        """
+        return self.activation > self.threshold
+
+    def step(self):
+        """
+        Advance every neuron by one tick.
+
+        Returns:
+            np.ndarray[bool]: The spike vector the tick was computed from.
+        """
+        spk = self.spikes()
+        neighbor_spk = spk[None, :] if self.neighbors is None else spk[self.neighbors]
+
+        # Timer resets to 255 on a spike, otherwise counts down to zero
+        self.timer = np.where(spk, 255, np.maximum(self.timer, 1) - 1).astype(np.uint8)
+
+        # Hebbian update: grow where both sides spike, shrink everywhere else,
+        # computed in uint8 without overflow: min(w, 255 - p) + p and max(w, p) - p
+        plasticity = np.where(self.local_data[:, 0] == 0, 1, self.local_data[:, 0]).astype(np.uint8)[:, None]
+        both = spk[:, None] & neighbor_spk
+        grown = np.minimum(self.weights, 255 - plasticity) + plasticity
+        np.maximum(self.weights, plasticity, out=self.weights)
+        self.weights -= plasticity
+        np.copyto(self.weights, grown, where=both)
+
+        # Weighted input from spiking neighbors, then decay and clamp
+        decay = np.where(self.local_data[:, 1] == 0, 1, self.local_data[:, 1]).astype(np.uint8)
+        if self.neighbors is None:
+            total_input = self.weights[:, spk].sum(axis=1, dtype=np.int64)
+        else:
+            total_input = np.where(neighbor_spk, self.weights, 0).sum(axis=1, dtype=np.int64)
+        self.activation = np.minimum(self.activation // decay + total_input, 255).astype(np.uint8)
+
+        # Threshold mutation from local_data[2], local data cycling, firing count
+        self.threshold = np.minimum(self.threshold.astype(np.int64) + self.local_data[:, 2], 255).astype(np.uint8)
+        self.local_data += 1
+        self.persistent_storage[spk, 0] += 1
+        return spk
+
+# Plasticity applied at a tick is local_data[0], or 1 when it is zero. local_data[0]
+# only ever cycles upwards by one per tick, so the total over any run of ticks has a
+# closed form, which lets SparseNetwork apply skipped weight decay lazily.
+PLASTICITY = np.maximum(np.arange(256, dtype=np.int64), 1)
+PLASTICITY_PREFIX = np.concatenate(([0], np.cumsum(PLASTICITY)))
+
+def plasticity_sum(end, length):
+    """
+    Total plasticity over `length` consecutive ticks whose local_data[0] values
+    run up to, but not including, `end` (all arguments are arrays).
+    """
+    def cumulative(x):
+        return (x // 256) * PLASTICITY_PREFIX[256] + PLASTICITY_PREFIX[x % 256]
+    base = end + 256 * (length // 256 + 1)
+    return cumulative(base) - cumulative(base - length)
+
+class SparseNetwork:
+    """
+    A population of 8-bit neurons with CSR synapse storage and spike-driven updates.
+
+    Weights are one uint8 per synapse; the neighbors of neuron i are
+    indices[indptr[i]:indptr[i + 1]] (see topology.py). A synapse only changes
+    away from pure decay when its neighbor spikes, so a tick only visits the
+    synapses of spiking neighbors: decay missed by untouched synapses is
+    applied in one step, from a per-synapse tick stamp, the next time they are
+    visited. Per-neuron state is updated for the whole population as in Network.
+    Results are identical to Network (and to Neuron.update against a snapshot).
+    """
+
+    def __init__(self, indptr, indices):
+        """
+        Initialize the population with the same defaults as Neuron.
+
+        Args:
+            indptr (array-like): CSR row pointers, length num_neurons + 1.
+            indices (array-like): CSR neighbor indices, one per synapse.
+
+        Attributes:
+            weights (np.ndarray[uint8]): Synapse strengths, valid as of each synapse's stamp.
+            stamps (np.ndarray[uint32]): Tick at which each synapse weight was last brought up to date.
+            tick (int): Number of steps taken.
+        """
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.size = len(self.indptr) - 1
+        self.weights = np.full(len(self.indices), 128, dtype=np.uint8)
+        self.stamps = np.zeros(len(self.indices), dtype=np.uint32)
+        self.tick = 0
+
+        # Reverse index: synapses grouped by the neighbor they listen to
+        self.order = np.argsort(self.indices, kind="stable").astype(np.int32)
+        self.incoming = np.zeros(self.size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=self.size), out=self.incoming[1:])
+
+        self.activation = np.zeros(self.size, dtype=np.uint8)
+        self.timer = np.zeros(self.size, dtype=np.uint8)
+        self.local_data = np.zeros((self.size, 8), dtype=np.uint8)
+        self.threshold = np.full(self.size, 128, dtype=np.uint8)
+        self.persistent_storage = np.zeros((self.size, 8), dtype=np.uint8)
+
+    def spikes(self):
+        """
+        Returns:
+            np.ndarray[bool]: True for every neuron whose activation exceeds its threshold.
+        """
+        return self.activation > self.threshold
+
+    def listening_to(self, neurons):
+        """
+        Args:
+            neurons (np.ndarray[int]): Neuron indices.
+
+        Returns:
+            np.ndarray[int]: Positions of every synapse whose neighbor is one of neurons.
+        """
+        starts = self.incoming[neurons]
+        counts = self.incoming[neurons + 1] - starts
+        shift = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        return self.order[shift + np.arange(counts.sum())]
+
+    def catch_up(self, synapses, rows):
+        """
+        Apply the decay each synapse missed since its stamp.
+
+        Returns:
+            np.ndarray[int64]: Current weights of the given synapses.
+        """
+        missed = self.tick - self.stamps[synapses].astype(np.int64)
+        decay = plasticity_sum(self.local_data[rows, 0].astype(np.int64), missed)
+        return np.maximum(self.weights[synapses].astype(np.int64) - decay, 0)
+
+    def materialize(self):
+        """
+        Bring every synapse weight up to date.
+
+        Returns:
+            np.ndarray[uint8]: All weights as of the last completed tick.
+        """
+        synapses = np.arange(len(self.weights))
+        rows = np.repeat(np.arange(self.size), np.diff(self.indptr))
+        self.weights[:] = self.catch_up(synapses, rows)
+        self.stamps[:] = self.tick
+        return self.weights
+
+    def step(self):
+        """
+        Advance every neuron by one tick, visiting only synapses of spiking neighbors.
+
+        Returns:
+            np.ndarray[bool]: The spike vector the tick was computed from.
+        """
+        spk = self.spikes()
+        synapses = self.listening_to(np.flatnonzero(spk))
+        rows = np.searchsorted(self.indptr, synapses, side="right") - 1
+
+        # Hebbian update on the visited synapses; all others decay lazily
+        weights = self.catch_up(synapses, rows)
+        plasticity = PLASTICITY[self.local_data[rows, 0]]
+        weights = np.where(spk[rows], np.minimum(weights + plasticity, 255), np.maximum(weights - plasticity, 0))
+        self.weights[synapses] = weights
+        self.stamps[synapses] = self.tick + 1
+
+        total_input = np.bincount(rows, weights=weights, minlength=self.size).astype(np.int64)
+        decay = PLASTICITY[self.local_data[:, 1]]
+        self.timer = np.where(spk, 255, np.maximum(self.timer, 1) - 1).astype(np.uint8)
+        self.activation = np.minimum(self.activation // decay + total_input, 255).astype(np.uint8)
+        self.threshold = np.minimum(self.threshold.astype(np.int64) + self.local_data[:, 2], 255).astype(np.uint8)
+        self.local_data += 1
+        self.persistent_storage[spk, 0] += 1
+        self.tick += 1
+        return spk
+
+
+# Self-test block
+if __name__ == "__main__":
+    import copy
+    import random
+    import time
+    from modules.language.core.algorithms.experimental import topology
+    from modules.language.core.algorithms.experimental.neuron import Neuron
+
+    # Equivalence with the per-object model on a small random population
+    random.seed(0)
+    size, degree, ticks = 64, 12, 40
+    neurons = [Neuron(degree) for _ in range(size)]
+    links = [random.sample(range(size), degree) for _ in range(size)]
+    for n in neurons:
+        n.activation = random.randrange(256)
+        n.threshold = random.randrange(256)
+        n.timer = random.randrange(256)
+        n.weights = [random.randrange(256) for _ in range(degree)]
+        n.local_data = [random.randrange(256) for _ in range(8)]
+        n.local_data[2] = random.randrange(4)
+    network = Network.from_neurons(neurons, links)
+    for _ in range(ticks):
+        snapshot = copy.deepcopy(neurons)
+        for n, ids in zip(neurons, links):
+            n.update([snapshot[i] for i in ids])
+        network.step()
+    expected = Network.from_neurons(neurons, links)
+    for name in ("activation", "timer", "weights", "local_data", "threshold", "persistent_storage"):
+        assert np.array_equal(getattr(network, name), getattr(expected, name)), name
+    print(f"Network matches Neuron.update over {ticks} ticks of {size} neurons.")
+
+    # Spike-driven CSR engine against the array engine on the same wiring
+    indptr, indices = topology.from_lists(links)
+    dense, sparse = Network(size, links), SparseNetwork(indptr, indices)
+    rng = np.random.default_rng(2)
+    for tick in range(600):
+        if tick % 50 == 0:  # Kick the population so spikes keep happening
+            kick = rng.integers(0, 256, size).astype(np.uint8)
+            dense.activation[:], sparse.activation[:] = kick, kick
+            dense.threshold[:], sparse.threshold[:] = 100, 100
+        assert np.array_equal(dense.step(), sparse.step())
+    assert np.array_equal(dense.weights.ravel(), sparse.materialize())
+    assert np.array_equal(dense.activation, sparse.activation)
+    print("SparseNetwork matches Network over 600 ticks.")
+
+    # Speed of one population step
+    for size, degree in ((10000, 100), (100000, 32)):
+        network = Network(size, np.random.default_rng(0).integers(0, size, (size, degree)))
+        network.activation[:] = np.random.default_rng(1).integers(0, 256, size)
+        start = time.time()
+        network.step()
+        elapsed_ms = (time.time() - start) * 1000
+        print(f"One step of {size} neurons with {degree} neighbors each took {elapsed_ms:.2f} milliseconds.")
+
+    for size, degree in ((100000, 32), (1000000, 16)):
+        network = SparseNetwork(*topology.random_k(size, degree, seed=0))
+        network.activation[:] = np.random.default_rng(1).integers(0, 256, size)
+        network.threshold[:] = 250
+        start = time.time()
+        spk = network.step()
+        elapsed_ms = (time.time() - start) * 1000
+        print(f"Sparse step of {size} neurons, {degree} synapses each, {spk.sum()} spikes took {elapsed_ms:.2f} milliseconds.")
@@ -20,14 +20,14 @@ class Neuron:
         Attributes:
             activation (int): Current activation level of the neuron (0-255).
             timer (int): Counts time since last spike; resets to 255 when neuron spikes.
-            weights (list[int]): Strengths of connections to neighbors, initialized mid-range (128).
+            weights (bytearray): Strengths of connections to neighbors, one byte each, initialized mid-range (128).
             local_data (list[int]): A list of 8 bytes for internal neuron state and processing.
             threshold (int): Activation threshold above which the neuron 'fires' (spikes).
             persistent_storage (list[int]): 8 bytes for long-term local storage.
         """
         self.activation = 0  # Activation level
         self.timer = 0  # How often it spikes
-        self.weights = [128] * num_neighbors  # Synapse strength to neighbors
+        self.weights = bytearray([128]) * num_neighbors  # Synapse strength to neighbors, 1 byte each
         self.local_data = [0] * 8  # Internal state, 8 bytes for flexibility
         self.threshold = 128  # Activation threshold for spiking
         self.persistent_storage = [0] * 8  # Persistent storage for internal use
@@ -65,11 +65,13 @@ class Neuron:
         # Determine plasticity factor from local_data (element 0), use 1 if zero to avoid no updates
         plasticity_factor = self.local_data[0] or 1
 
+        # Neighbor spikes do not change during this update, so read each one once
+        neighbor_spikes = [neighbor.spike() for neighbor in neighbors]
+
         # Update weights to each neighbor based on Hebbian principle:
         # Increase weight if both this neuron and neighbor spike,
         # otherwise decrease weight, all capped between 0 and 255
-        for i, neighbor in enumerate(neighbors):
-            n_spk = neighbor.spike()
+        for i, n_spk in enumerate(neighbor_spikes):
             if spk and n_spk:
                 self.weights[i] = min(255, self.weights[i] + plasticity_factor)
             else:
@@ -79,7 +81,7 @@ class Neuron:
         decay = self.local_data[1] or 1
 
         # Calculate total weighted input from neighbors that spike
-        total_input = sum(w * neighbor.spike() for w, neighbor in zip(self.weights, neighbors))
+        total_input = sum(w for w, n_spk in zip(self.weights, neighbor_spikes) if n_spk)
 
         # Update activation with decay and input, keeping result within 0-255 bounds
         self.activation = min(255, max(0, (self.activation // decay) + total_input))
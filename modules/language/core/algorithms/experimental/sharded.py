@@ -0,0 +1,268 @@
+import multiprocessing as mp
+import os
+from multiprocessing import shared_memory
+import numpy as np
+from modules.language.core.algorithms.experimental.network import Network
+
+class ShardedNetwork:
+    """
+    A Network whose neurons are split into contiguous shards, one per worker process.
+
+    Every neuron array, plus the synapse weights and neighbor indices, lives
+    in a single multiprocessing.shared_memory block. Workers update their own
+    rows in place, and the parent reads the same memory, so nothing is
+    copied between processes. Spikes are double buffered. In tick t every
+    worker reads buffer t % 2, which is the spike vector the tick is computed
+    from, and writes its shard's new spikes into buffer (t + 1) % 2. One
+    barrier per tick ensures all writes are visible before anyone reads them,
+    and that the buffer about to be overwritten is no longer being read.
+    Results are identical to Network.step, and so to Neuron.update against a
+    snapshot.
+    """
+
+    def __init__(self, num_neurons, neighbors=None, workers=None):
+        """
+        Initialize the population with the same defaults as Neuron and start the workers.
+
+        Args:
+            num_neurons (int): Number of neurons in the network.
+            neighbors (array-like | None): (num_neurons, k) neighbor indices as in Network;
+                None connects every neuron to every neuron.
+            workers (int | None): Worker processes (shards); all cores by default.
+        """
+        self.size = num_neurons
+        self.workers = max(1, min(workers or os.cpu_count(), num_neurons))
+        degree = num_neurons if neighbors is None else np.shape(neighbors)[1]
+        self.layout = [
+            ("activation", np.uint8, (num_neurons,)),
+            ("timer", np.uint8, (num_neurons,)),
+            ("threshold", np.uint8, (num_neurons,)),
+            ("local_data", np.uint8, (num_neurons, 8)),
+            ("persistent_storage", np.uint8, (num_neurons, 8)),
+            ("weights", np.uint8, (num_neurons, degree)),
+            ("spikes", np.bool_, (2, num_neurons)),
+            ("control", np.int64, (2,)),  # Ticks to run next, stop flag
+        ]
+        if neighbors is not None:
+            self.layout.append(("neighbors", np.int32, (num_neurons, degree)))
+        size = sum(int(np.prod(shape)) * np.dtype(dtype).itemsize for _, dtype, shape in self.layout)
+        self.memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self.arrays = attach(self.memory.buf, self.layout)
+        for name, value in (("threshold", 128), ("weights", 128)):
+            self.arrays[name][:] = value
+        if neighbors is not None:
+            self.arrays["neighbors"][:] = neighbors
+        self.tick = 0
+
+        bounds = np.linspace(0, num_neurons, self.workers + 1).astype(np.int64)
+        self.start_barrier = mp.Barrier(self.workers + 1)
+        self.done_barrier = mp.Barrier(self.workers + 1)
+        tick_barrier = mp.Barrier(self.workers)
+        self.processes = [
+            mp.Process(target=work, daemon=True,
+                       args=(self.memory.name, self.layout, bounds[i], bounds[i + 1],
+                             self.start_barrier, tick_barrier, self.done_barrier))
+            for i in range(self.workers)
+        ]
+        for process in self.processes:
+            process.start()
+
+    def __getattr__(self, name):
+        arrays = self.__dict__.get("arrays")
+        if arrays is not None and name in arrays:
+            return arrays[name]
+        raise AttributeError(name)
+
+    @classmethod
+    def from_network(cls, network, workers=None):
+        """
+        Args:
+            network (Network): Population whose current state is copied in.
+            workers (int | None): Worker processes.
+
+        Returns:
+            ShardedNetwork: A sharded copy of network.
+        """
+        sharded = cls(network.size, network.neighbors, workers)
+        for name in ("activation", "timer", "threshold", "local_data", "persistent_storage", "weights"):
+            sharded.arrays[name][:] = getattr(network, name)
+        return sharded
+
+    def to_network(self):
+        """
+        Returns:
+            Network: A single-process copy of the current state.
+        """
+        neighbors = self.arrays.get("neighbors")
+        network = Network(self.size, neighbors)
+        for name in ("activation", "timer", "threshold", "local_data", "persistent_storage", "weights"):
+            setattr(network, name, self.arrays[name].copy())
+        return network
+
+    def spikes(self):
+        """
+        Returns:
+            np.ndarray[bool]: True for every neuron whose activation exceeds its threshold.
+        """
+        return self.arrays["activation"] > self.arrays["threshold"]
+
+    def run(self, ticks):
+        """
+        Advance every neuron by ticks ticks across the workers.
+
+        Returns:
+            np.ndarray[bool]: The spike vector the last tick was computed from (a copy).
+        """
+        if ticks <= 0:
+            return self.spikes()
+        parity = self.tick % 2
+        self.arrays["spikes"][parity] = self.spikes()
+        self.arrays["control"][0] = ticks
+        self.start_barrier.wait()
+        self.done_barrier.wait()
+        self.tick += ticks
+        return self.arrays["spikes"][(self.tick - 1) % 2].copy()
+
+    def step(self):
+        return self.run(1)
+
+    def close(self):
+        """Stop the workers and free the shared memory."""
+        if self.memory is None:
+            return
+        self.arrays["control"][1] = 1
+        self.start_barrier.wait()
+        for process in self.processes:
+            process.join()
+        self.arrays = None
+        self.memory.unlink()
+        try:
+            self.memory.close()
+        except BufferError:
+            pass  # A caller still holds a view; the mapping goes when it does
+        self.memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def attach(buffer, layout):
+    """Numpy views of every array in layout, packed back to back in buffer."""
+    arrays = {}
+    offset = 0
+    for name, dtype, shape in layout:
+        count = int(np.prod(shape))
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+        offset += count * np.dtype(dtype).itemsize
+    return arrays
+
+def step_shard(a, lo, hi, spk):
+    """
+    Network.step for neurons lo:hi, written in place into the shared arrays.
+
+    Args:
+        a (dict[str, np.ndarray]): Shared arrays from attach().
+        lo, hi (int): The shard's neuron range.
+        spk (np.ndarray[bool]): The whole population's spike vector for this tick.
+
+    Returns:
+        np.ndarray[bool]: The shard's spikes after the update.
+    """
+    own = spk[lo:hi]
+    neighbors = a.get("neighbors")
+    neighbor_spk = spk[None, :] if neighbors is None else spk[neighbors[lo:hi]]
+    local_data = a["local_data"][lo:hi]
+    weights = a["weights"][lo:hi]
+
+    timer = a["timer"][lo:hi]
+    timer[:] = np.where(own, 255, np.maximum(timer, 1) - 1)
+
+    plasticity = np.where(local_data[:, 0] == 0, 1, local_data[:, 0]).astype(np.uint8)[:, None]
+    both = own[:, None] & neighbor_spk
+    grown = np.minimum(weights, 255 - plasticity) + plasticity
+    np.maximum(weights, plasticity, out=weights)
+    weights -= plasticity
+    np.copyto(weights, grown, where=both)
+
+    decay = np.where(local_data[:, 1] == 0, 1, local_data[:, 1]).astype(np.uint8)
+    if neighbors is None:
+        total_input = weights[:, spk].sum(axis=1, dtype=np.int64)
+    else:
+        total_input = np.where(neighbor_spk, weights, 0).sum(axis=1, dtype=np.int64)
+    activation = a["activation"][lo:hi]
+    activation[:] = np.minimum(activation // decay + total_input, 255)
+
+    threshold = a["threshold"][lo:hi]
+    threshold[:] = np.minimum(threshold.astype(np.int64) + local_data[:, 2], 255)
+    local_data += 1
+    a["persistent_storage"][lo:hi][own, 0] += 1
+    return activation > threshold
+
+def work(name, layout, lo, hi, start_barrier, tick_barrier, done_barrier):
+    """Worker process: step neurons lo:hi every tick the parent asks for."""
+    memory = shared_memory.SharedMemory(name=name)
+    a = attach(memory.buf, layout)
+    spikes = a["spikes"]
+    tick = 0
+    try:
+        while True:
+            start_barrier.wait()
+            if a["control"][1]:
+                break
+            for _ in range(int(a["control"][0])):
+                spikes[(tick + 1) % 2, lo:hi] = step_shard(a, lo, hi, spikes[tick % 2])
+                tick += 1
+                tick_barrier.wait()
+            done_barrier.wait()
+    finally:
+        del a, spikes
+        memory.close()
+
+
+# Self-test block
+if __name__ == "__main__":
+    import copy
+    import random
+    from modules.language.core.algorithms.experimental.neuron import Neuron
+
+    # Equivalence with Neuron.update against a snapshot, for several shard counts
+    random.seed(0)
+    size, degree, ticks = 48, 10, 30
+    neurons = [Neuron(degree) for _ in range(size)]
+    links = [random.sample(range(size), degree) for _ in range(size)]
+    for n in neurons:
+        n.activation = random.randrange(256)
+        n.threshold = random.randrange(256)
+        n.weights = bytearray(random.randrange(256) for _ in range(degree))
+        n.local_data = [random.randrange(256) for _ in range(8)]
+        n.local_data[2] = random.randrange(4)
+    start = Network.from_neurons(neurons, links)
+    for _ in range(ticks):
+        snapshot = copy.deepcopy(neurons)
+        for n, ids in zip(neurons, links):
+            n.update([snapshot[i] for i in ids])
+    expected = Network.from_neurons(neurons, links)
+    for workers in (1, 2, 3):
+        with ShardedNetwork.from_network(start, workers) as sharded:
+            sharded.run(ticks // 2)
+            for _ in range(ticks - ticks // 2):
+                sharded.step()
+            for name in ("activation", "timer", "threshold", "local_data", "persistent_storage", "weights"):
+                assert (getattr(sharded, name) == getattr(expected, name)).all(), (workers, name)
+    print(f"ShardedNetwork matches Neuron.update over {ticks} ticks with 1-3 workers.")
+
+    # Larger network against the single-process engine
+    rng = np.random.default_rng(1)
+    size, degree, ticks = 20000, 32, 50
+    reference = Network(size, rng.integers(0, size, (size, degree)))
+    reference.activation[:] = rng.integers(0, 256, size)
+    reference.local_data[:, 2] = rng.integers(0, 3, size)
+    with ShardedNetwork.from_network(reference, 2) as sharded:
+        sharded.run(ticks)
+        for _ in range(ticks):
+            reference.step()
+        for name in ("activation", "timer", "threshold", "local_data", "persistent_storage", "weights"):
+            assert (getattr(sharded, name) == getattr(reference, name)).all(), name
+    print(f"ShardedNetwork matches Network on {size} neurons x {degree} synapses over {ticks} ticks.")
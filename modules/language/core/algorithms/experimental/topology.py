@@ -0,0 +1,91 @@
+"""
+Sparse connection patterns for neuron networks.
+
+Every builder returns CSR arrays (indptr, indices): the neighbors of neuron i
+are indices[indptr[i]:indptr[i + 1]], in weight order.
+"""
+import numpy as np
+
+def from_lists(neighbor_lists):
+    """
+    Args:
+        neighbor_lists (list[list[int]]): Neighbor indices per neuron.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: CSR (indptr, indices).
+    """
+    indptr = np.zeros(len(neighbor_lists) + 1, dtype=np.int64)
+    np.cumsum([len(ids) for ids in neighbor_lists], out=indptr[1:])
+    indices = np.fromiter((i for ids in neighbor_lists for i in ids), dtype=np.int32, count=indptr[-1])
+    return indptr, indices
+
+def from_rows(neighbors):
+    """
+    Args:
+        neighbors (np.ndarray): (num_neurons, k) neighbor indices, k per neuron.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: CSR (indptr, indices).
+    """
+    neighbors = np.asarray(neighbors)
+    indptr = np.arange(neighbors.shape[0] + 1, dtype=np.int64) * neighbors.shape[1]
+    return indptr, neighbors.astype(np.int32).ravel()
+
+def k_nearest(num_neurons, k):
+    """
+    Ring lattice: each neuron connects to its k nearest neurons by index, k // 2 on each side.
+
+    Args:
+        num_neurons (int): Number of neurons on the ring.
+        k (int): Neighbors per neuron (at most num_neurons - 1, rounded down to an even number).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: CSR (indptr, indices).
+    """
+    half = min(k, num_neurons - 1) // 2  # More would wrap around the ring onto the same neighbors
+    offsets = np.concatenate((np.arange(-half, 0), np.arange(1, half + 1)))
+    return from_rows((np.arange(num_neurons)[:, None] + offsets) % num_neurons)
+
+def random_k(num_neurons, k, seed=None):
+    """
+    Each neuron connects to k neurons drawn uniformly (with replacement) from all others.
+
+    Args:
+        num_neurons (int): Number of neurons.
+        k (int): Neighbors per neuron, at most num_neurons - 1; a single neuron gets none.
+        seed (int | None): Seed for reproducible wiring.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: CSR (indptr, indices).
+    """
+    k = min(k, num_neurons - 1)
+    if k <= 0:
+        return from_rows(np.empty((num_neurons, 0), dtype=np.int32))
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, num_neurons - 1, (num_neurons, k))
+    picks += picks >= np.arange(num_neurons)[:, None]  # Skip self
+    return from_rows(picks)
+
+def local(width, height, radius):
+    """
+    Neurons on a width x height grid connect to every neuron within Chebyshev distance radius.
+    Neurons near an edge have fewer neighbors.
+
+    Args:
+        width (int): Grid columns.
+        height (int): Grid rows.
+        radius (int): Connection radius in grid cells.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: CSR (indptr, indices) over width * height neurons.
+    """
+    ys, xs = np.divmod(np.arange(width * height), width)
+    span = np.arange(-radius, radius + 1)
+    dy, dx = (a.ravel() for a in np.meshgrid(span, span, indexing="ij"))
+    keep = (dy != 0) | (dx != 0)
+    dy, dx = dy[keep], dx[keep]
+    ny, nx = ys[:, None] + dy, xs[:, None] + dx
+    valid = (ny >= 0) & (ny < height) & (nx >= 0) & (nx < width)
+    indptr = np.zeros(width * height + 1, dtype=np.int64)
+    np.cumsum(valid.sum(axis=1), out=indptr[1:])
+    return indptr, (ny * width + nx)[valid].astype(np.int32)
@@ -0,0 +1,54 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+MAX_ENTRIES = 4096  # Results kept; each holds its input bytes plus any analyses computed so far
+
+def digest(data):
+    """Content key of a payload: 128-bit BLAKE2b, hex encoded."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+class AnalysisCache:
+    """Analysis results keyed by the hash of their input, least recently used evicted first."""
+
+    def __init__(self, maxsize=MAX_ENTRIES):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            result = self.entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key, result):
+        with self.lock:
+            self.entries[key] = result
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def resize(self, maxsize):
+        with self.lock:
+            self.maxsize = maxsize
+            while len(self.entries) > maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+results = AnalysisCache()
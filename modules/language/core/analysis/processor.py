@@ -1,23 +1,38 @@
-from modules.language.core.analysis.tools import ascii, binary, byte, delta, hex, xor
 from modules.language.core.analysis.metadata import length, source, timestamp
+from modules.language.core.analysis import cache, vectorized
+from modules.language.core.analysis.result import AnalysisResult
 
 def process(text):
+    return AnalysisResult(text.encode('utf-8'))
+
+def process_cached(text):
+    """
+    process(text) through the content-hash cache.
+
+    Returns (result, seen, key): a repeated input gets the earlier result back,
+    with its original timestamp, and seen is True. key is the input's digest,
+    to pass on to saving.DedupStore.write instead of hashing it again.
+    """
+    byte_data = text.encode('utf-8')
+    key = cache.digest(byte_data)
+    result = cache.results.get(key)
+    if result is not None:
+        return result, True, key
+    result = AnalysisResult(byte_data)
+    cache.results.put(key, result)
+    return result, False, key
+
+def process_array(text, views=()):
     byte_data = text.encode('utf-8')
 
-    result = {
+    return {
         "metadata": {
             "length": length.generate(text),
             "timestamp": timestamp.generate(text),
             "source": source.generate(text),
         },
-        "analysis": {
-            "ascii": ascii.analyze(byte_data),
-            "binary": binary.analyze(byte_data),
-            "byte": byte.analyze(byte_data),
-            "delta": delta.analyze(byte_data),
-            "hex": hex.analyze(byte_data),
-            "xor": xor.analyze(byte_data),
-        }
+        "analysis": vectorized.analyze(byte_data, views),
     }
 
-    return result
+def process_batch(texts, views=()):
+    return vectorized.analyze_batch(texts, views)
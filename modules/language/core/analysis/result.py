@@ -0,0 +1,127 @@
+from collections.abc import Mapping
+from modules.language.core.analysis import vectorized
+from modules.language.core.analysis.metadata import length, source, timestamp
+
+def _source(result):
+    return source.generate(result.text())
+
+def _length(result):
+    return length.generate(result.text())
+
+def _timestamp(result):
+    return result.timestamp
+
+def _byte(result):
+    return result.data
+
+def _delta(result):
+    return vectorized.delta(vectorized.view(result.data))
+
+def _xor(result):
+    return vectorized.xor(vectorized.view(result.data))
+
+def _strings(kind):
+    return lambda result: vectorized.strings(vectorized.view(result.data), kind)
+
+METADATA = {
+    "length": _length,
+    "timestamp": _timestamp,
+    "source": _source,
+}
+
+ANALYSIS = {
+    "ascii": _strings("ascii"),
+    "binary": _strings("binary"),
+    "byte": _byte,
+    "delta": _delta,
+    "hex": _strings("hex"),
+    "xor": _xor,
+}
+
+# Cheap to rebuild on every access, so never held in the cache
+UNCACHED = {"source", "timestamp", "byte"}
+
+class Section(Mapping):
+    """Read-only dict view over one section ("metadata" or "analysis") of a result."""
+
+    __slots__ = ("result", "builders")
+
+    def __init__(self, result, builders):
+        self.result = result
+        self.builders = builders
+
+    def __getitem__(self, key):
+        if key not in self.builders:
+            raise KeyError(key)
+        return self.result.get_value(key, self.builders[key])
+
+    def __iter__(self):
+        return iter(self.builders)
+
+    def __len__(self):
+        return len(self.builders)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+class AnalysisResult(Mapping):
+    """
+    Compact, lazily evaluated result of processor.process.
+
+    Only the encoded input is stored, as a single memoryview. Every analysis
+    is computed on first access and cached; the nested dict interface
+    (result["analysis"]["delta"], result["metadata"]["length"], ...) is kept.
+    """
+
+    __slots__ = ("data", "timestamp", "cache")
+
+    SECTIONS = {"metadata": METADATA, "analysis": ANALYSIS}
+
+    def __init__(self, data, stamp=None):
+        self.data = memoryview(data).cast("B")
+        self.timestamp = stamp if stamp is not None else timestamp.generate(data)
+        self.cache = None
+
+    def text(self):
+        return str(self.data, "utf-8")
+
+    def get_value(self, key, builder):
+        if key in UNCACHED:
+            return builder(self)
+        if self.cache is None:
+            self.cache = {}
+        if key not in self.cache:
+            self.cache[key] = builder(self)
+        return self.cache[key]
+
+    def release(self):
+        """Drop every cached analysis, keeping only the input bytes."""
+        self.cache = None
+
+    def to_dict(self):
+        """Plain nested dict in the original process() layout, without filling the cache."""
+        cache = self.cache or {}
+        output = {}
+        for name, builders in self.SECTIONS.items():
+            section = {}
+            for key, builder in builders.items():
+                value = cache[key] if key in cache else builder(self)
+                if key == "byte":
+                    value = bytes(value)
+                elif hasattr(value, "tolist"):
+                    value = value.tolist()
+                section[key] = value
+            output[name] = section
+        return output
+
+    def __getitem__(self, key):
+        return Section(self, self.SECTIONS[key])
+
+    def __iter__(self):
+        return iter(self.SECTIONS)
+
+    def __len__(self):
+        return len(self.SECTIONS)
+
+    def __repr__(self):
+        return repr(self.to_dict())
@@ -0,0 +1,77 @@
+import numpy as np
+
+# Lookup tables for the string views, built once for the whole 8-bit space
+HEX = np.array([format(b, '02X') for b in range(256)])
+BINARY = np.array([format(b, '08b') for b in range(256)])
+ASCII = np.array([chr(b) if 32 <= b <= 126 else f"[{b}]" for b in range(256)])
+
+VIEWS = {"ascii": ASCII, "binary": BINARY, "hex": HEX}
+
+def view(byte_data):
+    """Zero-copy uint8 view over bytes, bytearray, memoryview or an existing array."""
+    if isinstance(byte_data, np.ndarray):
+        return byte_data.astype(np.uint8, copy=False)
+    return np.frombuffer(byte_data, dtype=np.uint8)
+
+def delta(values):
+    """Signed difference between neighbouring bytes, same values as tools/delta.py."""
+    wide = values.astype(np.int16)
+    return wide[1:] - wide[:-1]
+
+def xor(values):
+    """XOR between neighbouring bytes, same values as tools/xor.py."""
+    return values[1:] ^ values[:-1]
+
+def strings(values, kind):
+    """Build one of the string views (ascii, binary, hex) for a uint8 array."""
+    return VIEWS[kind][values].tolist()
+
+def analyze(byte_data, views=()):
+    """Analyze one input in a single pass and return arrays keyed like processor.process."""
+    values = view(byte_data)
+    result = {
+        "byte": values,
+        "delta": delta(values),
+        "xor": xor(values),
+    }
+    for kind in views:
+        result[kind] = strings(values, kind)
+    return result
+
+def analyze_batch(texts, views=()):
+    """
+    Analyze many texts at once over one concatenated uint8 buffer.
+
+    Returns flat arrays plus offsets: input k owns byte[offsets[k]:offsets[k + 1]]
+    and delta/xor[pair_offsets[k]:pair_offsets[k + 1]]. Pairs that would cross
+    from one input into the next are dropped so every slice matches analyze().
+    """
+    encoded = [t.encode('utf-8') if isinstance(t, str) else bytes(t) for t in texts]
+    lengths = np.fromiter((len(e) for e in encoded), dtype=np.int64, count=len(encoded))
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    values = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    keep = np.ones(max(len(values) - 1, 0), dtype=bool)
+    starts = offsets[1:-1]
+    keep[starts[(starts > 0) & (starts < len(values))] - 1] = False
+
+    pair_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(np.maximum(lengths - 1, 0), out=pair_offsets[1:])
+
+    result = {
+        "byte": values,
+        "delta": delta(values)[keep],
+        "xor": xor(values)[keep],
+        "offsets": offsets,
+        "pair_offsets": pair_offsets,
+    }
+    for kind in views:
+        result[kind] = strings(values, kind)
+    return result
+
+def split(batch, key):
+    """Split a flat batch array back into one array per input."""
+    bounds = batch["pair_offsets"] if key in ("delta", "xor") else batch["offsets"]
+    flat = batch[key]
+    return [flat[bounds[i]:bounds[i + 1]] for i in range(len(bounds) - 1)]
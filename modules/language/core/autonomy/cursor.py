@@ -0,0 +1,39 @@
+import json
+import os
+from pathlib import Path
+
+class Cursor:
+    """
+    Persisted ingestion position of the daemon.
+
+    The daemon trains memory log records in sequence order, so the sequence
+    number of the last trained record is enough to tell which records are new
+    after a restart. The learned state itself lives only in snapshots: the
+    cursor is saved after the snapshot it belongs to, so it never runs ahead
+    of the state a restart restores. A cursor from before the log is ignored.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.last = -1
+        self.count = 0
+        if self.path.exists():
+            state = json.loads(self.path.read_text())
+            if isinstance(state.get("last"), int):
+                self.last = state["last"]
+                self.count = state.get("count", 0)
+
+    def advance(self, sequence):
+        self.last = max(self.last, sequence)
+        self.count += 1
+
+    def state(self):
+        """The position, as save() writes it."""
+        return {"last": self.last, "count": self.count}
+
+    def save(self, state=None):
+        """Atomically write the cursor (or a state() taken earlier) so a crash never leaves it half written."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state or self.state()))
+        os.replace(tmp, self.path)
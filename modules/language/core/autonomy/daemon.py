@@ -1,35 +1,140 @@
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from time import sleep
-from modules.language.core.memory import saving
+from modules.language.core.memory import format, snapshot
+from modules.language.core.memory import log as memory_log
 from modules.language.core.algorithms.basic import delta
 from modules.language.core.algorithms.basic import byte
 from modules.language.core.algorithms.basic import xor
+from modules.language.core.autonomy import training, watch
+from modules.language.core.autonomy.cursor import Cursor
+from modules.language.core.instrumentation import metrics
 
-INPUT_DIR = Path("data/neural/language/input/user")
-OUTPUT_DIR = Path("data/neural/language/learned/delta")
+LOG_DIR = memory_log.DIRECTORY
+CURSOR_PATH = Path("data/neural/language/state/daemon_cursor.json")
+SNAPSHOT_DIR = snapshot.DIRECTORY
+SNAPSHOT_INTERVAL = 60.0  # Seconds between checkpoints while there is new data
+TABLES = {"delta": delta}  # Trained by the daemon, persisted by its checkpoint snapshots
+QUEUE_SIZE = 1024
+BATCH_SIZE = QUEUE_SIZE  # Most records drained from the queue per training round
+PARALLEL_MIN = 64  # Smaller rounds are cheaper to train in-process than to ship to the pool
+WAKE_INTERVAL = 1.0  # Longest wait for a log change before the log is checked anyway
 
-def run():
+def ingest(log, cursor, work):
+    """Feed input records appended since the cursor into the bounded work queue; put() blocks while the trainer is behind."""
+    watcher = watch.watch(log.directory, (memory_log.SEGMENT_SUFFIX,), watch.IN_MODIFY | watch.IN_CREATE)
+    after = cursor.last
+    while True:
+        log.refresh()
+        for sequence in log.sequences(format.KIND_INPUT, after):
+            work.put(sequence)
+            after = sequence
+            metrics.count("daemon_ingested_total")
+        watcher.events(WAKE_INTERVAL)
+
+def drain(work, first):
+    batch = [first]
+    while len(batch) < BATCH_SIZE:
+        try:
+            batch.append(work.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+def train_batch(log, batch, executor, workers):
+    if executor is not None and len(batch) >= PARALLEL_MIN:
+        return training.train_records([log.locate(s) for s in batch], executor, workers, tuple(TABLES))["delta"]
+    result = None
+    for sequence in batch:
+        try:
+            result = delta.train(log.load_input(sequence))
+        except Exception as e:
+            print(f"Error processing record {sequence}: {e}")
+            metrics.count("daemon_errors_total")
+    return result
+
+def lag(log, sequence):
+    """Seconds between an input being stored and the daemon finishing training on it."""
+    try:
+        header, _ = log.read(sequence)
+        return time.time() - datetime.strptime(header["timestamp"], "%Y%m%d_%H%M%S").timestamp()
+    except (KeyError, ValueError):
+        return 0.0
+
+def checkpoint(cursor, snapshot_dir):
+    """
+    Snapshot the learned state in the background and save the cursor once the snapshot is on disk.
+
+    The cursor is never written ahead of the newest snapshot, so a restart
+    resumes from a position the restored state has actually trained up to.
+
+    Returns:
+        threading.Thread | None: The writer, or None if the previous checkpoint is still being written.
+    """
+    state = cursor.state()
+    return snapshot.save_async(snapshot_dir, cursor, then=lambda path: cursor.save(state))
+
+def warm_start(cursor, snapshot_dir, meta=None):
+    """
+    Restore the newest snapshot (unless the caller already did and passes its meta) and rewind the
+    cursor to it, so only newer memories are replayed. Without a snapshot there is no trained state,
+    so the whole log is replayed.
+    """
+    if meta is None:
+        with metrics.timer("daemon_stage_seconds", stage="restore"):
+            meta = snapshot.restore(snapshot_dir)
+    if meta is None:
+        cursor.last = -1
+        cursor.count = 0
+        return None
+    cursor.last = meta["cursor"]
+    cursor.count = meta["count"]
+    print(f"Restored {meta['path']}; replaying records after {cursor.last}")
+    return meta
+
+def run(log_dir=LOG_DIR, cursor_path=CURSOR_PATH, queue_size=QUEUE_SIZE, workers=0,
+        snapshot_dir=SNAPSHOT_DIR, snapshot_interval=SNAPSHOT_INTERVAL, restored=None):
+    """
+    Train on new input records of the memory log forever; workers > 1 trains large backlogs on a process pool.
+    The log is only read, so any one process (main, the server) can write it meanwhile.
+    Learned state is restored from the newest snapshot at start, unless the caller already restored one
+    and passes its metadata as restored. Progress is checkpointed (snapshot, then
+    cursor) every snapshot_interval seconds while there is new data, and right after the first batch when
+    there was no snapshot to start from.
+    """
     print("Daemon activated. Listening to memory...")
-    processed = set()
+    metrics.setup()
+    log = memory_log.MemoryLog(log_dir, readonly=True)
+    cursor = Cursor(cursor_path)
+    restored = warm_start(cursor, snapshot_dir, restored)
+    checkpoint_at = time.monotonic() if restored else float("-inf")
+    dirty = False
+    work = queue.Queue(maxsize=queue_size)
+    threading.Thread(target=ingest, args=(log, cursor, work), daemon=True).start()
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
 
     while True:
-        for file in INPUT_DIR.glob("*.py"):
-            if file.name in processed:
-                continue
-
-            try:
-                content = file.read_text()
-                local_vars = {}
-                exec(content, {}, local_vars)
-                data = local_vars.get("analyzed")
-
-                if data:
-                    result = delta.train(data)
-                    saving.write_learned(result, OUTPUT_DIR)
-                    processed.add(file.name)
-            except Exception as e:
-                print(f"Error processing {file.name}: {e}")
-        sleep(15)
+        if dirty and time.monotonic() - checkpoint_at >= snapshot_interval and checkpoint(cursor, snapshot_dir):
+            checkpoint_at = time.monotonic()
+            dirty = False
+        try:
+            wait = max(checkpoint_at + snapshot_interval - time.monotonic(), WAKE_INTERVAL) if dirty else None
+            first = work.get(timeout=wait)
+        except queue.Empty:
+            continue
+        batch = drain(work, first)
+        metrics.gauge("daemon_queue_depth", work.qsize())
+        with metrics.timer("daemon_stage_seconds", stage="train"):
+            train_batch(log, batch, executor, workers)
+        metrics.count("daemon_records_total", len(batch))
+        if metrics.ENABLED:
+            metrics.gauge("daemon_lag_seconds", lag(log, batch[-1]))
+        for sequence in batch:
+            cursor.advance(sequence)
+        dirty = True
 
 if __name__ == "__main__":
     run()
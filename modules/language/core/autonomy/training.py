@@ -0,0 +1,51 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import numpy as np
+from modules.language.core.analysis.result import AnalysisResult
+from modules.language.core.algorithms.basic import byte, delta, xor
+
+ALGORITHMS = {"byte": byte, "delta": delta, "xor": xor}
+SHARD_SIZE = 256  # Records per task: large enough to amortize pickling, small enough to balance
+
+def count_records(locations, names=tuple(ALGORITHMS)):
+    """
+    Worker: partial, unsaturated 256-bin counts for each named algorithm over a shard of
+    memory log records, given as MemoryLog.locate() tuples.
+    """
+    totals = {name: np.zeros(256, dtype=np.int64) for name in names}
+    files = {}
+    try:
+        for path, offset, length, stamp in locations:
+            if path not in files:
+                files[path] = open(path, "rb")
+            memory = AnalysisResult(os.pread(files[path].fileno(), length, offset), stamp)
+            for name, total in totals.items():
+                total += ALGORITHMS[name].count(memory)
+    finally:
+        for f in files.values():
+            f.close()
+    return totals
+
+def reduce(partials, names=tuple(ALGORITHMS)):
+    """Sum partial tables and merge them into the live tables with saturate-at-255."""
+    totals = {name: np.zeros(256, dtype=np.int64) for name in names}
+    for partial in partials:
+        for name, total in totals.items():
+            total += partial[name]
+    return {name: ALGORITHMS[name].merge(counts) for name, counts in totals.items()}
+
+def shards(items, workers, size=SHARD_SIZE):
+    """Split items (record locations) into shards, small enough that every worker gets several."""
+    items = list(items)
+    size = max(1, min(size, -(-len(items) // (workers * 4))))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def train_records(locations, executor=None, workers=None, names=tuple(ALGORITHMS)):
+    """Train the named algorithms on memory log records (MemoryLog.locate() tuples) with a process pool."""
+    workers = workers or os.cpu_count()
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return train_records(locations, executor, workers, names)
+    partials = executor.map(count_records, shards(locations, workers), repeat(names))
+    return reduce(partials, names)
@@ -0,0 +1,113 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from pathlib import Path
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000  # The kernel queue overflowed and events were dropped
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+EVENT = struct.Struct("iIII")
+
+POLL_INTERVAL = 1.0
+
+class InotifyWatcher:
+    """
+    Reports files that finished being written (or were moved) into a directory.
+
+    If the kernel's event queue overflows, events are lost, so every file in the
+    directory is reported instead; callers skip the ones they already have.
+    """
+
+    def __init__(self, directory, suffixes, mask=IN_CLOSE_WRITE | IN_MOVED_TO):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.directory = Path(directory)
+        self.suffixes = suffixes
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"inotify_add_watch failed for {directory}")
+
+    def events(self, timeout=None):
+        """Block until files arrive (or timeout) and return their names."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        names = []
+        offset = 0
+        overflow = False
+        while offset < len(buffer):
+            _, mask, _, length = EVENT.unpack_from(buffer, offset)
+            offset += EVENT.size
+            name = os.fsdecode(buffer[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+            elif name.endswith(self.suffixes):
+                names.append(name)
+        if overflow:
+            return self.rescan()
+        return names
+
+    def rescan(self):
+        """Every matching file in the directory, oldest name first."""
+        with os.scandir(self.directory) as entries:
+            return sorted(e.name for e in entries if e.name.endswith(self.suffixes))
+
+    def close(self):
+        os.close(self.fd)
+
+class PollWatcher:
+    """Fallback for platforms without inotify: rescans the directory every interval."""
+
+    def __init__(self, directory, suffixes, interval=POLL_INTERVAL):
+        self.directory = Path(directory)
+        self.suffixes = suffixes
+        self.interval = interval
+        # A file is only reported once its size has not changed between two scans
+        self.sizes = self.scan()
+        self.reported = set(self.sizes)
+
+    def scan(self):
+        sizes = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(self.suffixes):
+                    sizes[entry.name] = entry.stat().st_size
+        return sizes
+
+    def events(self, timeout=None):
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        sizes = self.scan()
+        names = sorted(name for name, size in sizes.items()
+                       if name not in self.reported and self.sizes.get(name) == size)
+        self.reported.update(names)
+        self.reported.intersection_update(sizes)
+        self.sizes = sizes
+        return names
+
+    def close(self):
+        pass
+
+def watch(directory, suffixes, mask=IN_CLOSE_WRITE | IN_MOVED_TO):
+    """Watch directory with inotify (for the events in mask) where available, polling otherwise."""
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    try:
+        return InotifyWatcher(directory, suffixes, mask)
+    except (OSError, AttributeError):
+        return PollWatcher(directory, suffixes)
@@ -0,0 +1,206 @@
+"""
+Counters, gauges and stage timers for the main loop and the daemon.
+
+Everything is off unless ZENURA_METRICS is set (or enable() is called).
+While off, timer() hands back one shared no-op context manager and
+count()/gauge() return after a single flag check, so instrumented code
+pays close to nothing. While on, the values can be read as Prometheus
+text from an HTTP endpoint (ZENURA_METRICS_PORT) or dumped to a JSON file
+at a fixed interval (ZENURA_METRICS_DUMP).
+
+    with metrics.timer("main_stage_seconds", stage="analysis"):
+        result = processor.process(text)
+    metrics.count("daemon_records_total", len(batch))
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ENABLED = os.environ.get("ZENURA_METRICS", "") not in ("", "0")
+BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)  # Timer bounds, seconds
+DUMP_INTERVAL = 10.0  # Seconds between JSON dumps
+
+lock = threading.Lock()
+counters = {}  # (name, labels) -> float
+gauges = {}  # (name, labels) -> float
+histograms = {}  # (name, labels) -> [bucket counts..., +Inf count, sum]
+
+def enable():
+    global ENABLED
+    ENABLED = True
+
+def disable():
+    global ENABLED
+    ENABLED = False
+
+def reset():
+    with lock:
+        counters.clear()
+        gauges.clear()
+        histograms.clear()
+
+def key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+def count(name, n=1, **labels):
+    if not ENABLED:
+        return
+    k = key(name, labels)
+    with lock:
+        counters[k] = counters.get(k, 0) + n
+
+def gauge(name, value, **labels):
+    if not ENABLED:
+        return
+    with lock:
+        gauges[key(name, labels)] = value
+
+def observe(name, seconds, **labels):
+    if not ENABLED:
+        return
+    k = key(name, labels)
+    with lock:
+        histogram = histograms.get(k)
+        if histogram is None:
+            histogram = histograms[k] = [0] * (len(BUCKETS) + 2)
+        histogram[bisect_left(BUCKETS, seconds)] += 1
+        histogram[-1] += seconds
+
+class Timer:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.start, **self.labels)
+
+class NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+NULL_TIMER = NullTimer()
+
+def timer(name, **labels):
+    """Context manager recording the duration of its block into the histogram name."""
+    return Timer(name, labels) if ENABLED else NULL_TIMER
+
+def format_labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+def render():
+    """All metrics in the Prometheus text exposition format."""
+    with lock:
+        counter_items = sorted(counters.items())
+        gauge_items = sorted(gauges.items())
+        histogram_items = sorted((k, list(v)) for k, v in histograms.items())
+    lines = []
+    typed = set()
+    for kind, items in (("counter", counter_items), ("gauge", gauge_items)):
+        for (name, labels), value in items:
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name}{format_labels(labels)} {value}")
+    for (name, labels), histogram in histogram_items:
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for bound, n in zip(BUCKETS + ("+Inf",), histogram[:-1]):
+            cumulative += n
+            lines.append(f"{name}_bucket{format_labels(labels, [('le', bound)])} {cumulative}")
+        lines.append(f"{name}_sum{format_labels(labels)} {histogram[-1]}")
+        lines.append(f"{name}_count{format_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+def snapshot():
+    """All metrics as a JSON-ready dict."""
+    def name_of(k):
+        return k[0] + format_labels(k[1])
+
+    with lock:
+        return {
+            "time": time.time(),
+            "counters": {name_of(k): v for k, v in counters.items()},
+            "gauges": {name_of(k): v for k, v in gauges.items()},
+            "timers": {name_of(k): {"count": sum(v[:-1]), "sum": v[-1], "buckets": dict(zip(map(str, BUCKETS + ("+Inf",)), v[:-1]))}
+                       for k, v in histograms.items()},
+        }
+
+def dump(path):
+    """Atomically write snapshot() as JSON to path."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(snapshot(), indent=2))
+    os.replace(tmp, path)
+
+def start_dump(path, interval=DUMP_INTERVAL):
+    """Dump to path every interval seconds on a background thread."""
+    def loop():
+        while True:
+            time.sleep(interval)
+            dump(path)
+
+    thread = threading.Thread(target=loop, daemon=True)
+    thread.start()
+    return thread
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass  # Scrapes would flood the console
+
+def serve(port, host="127.0.0.1"):
+    """Serve render() at http://host:port/metrics on a background thread."""
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+started = False
+starting = threading.Lock()  # main.py and the daemon thread may call setup() at the same time
+
+def setup():
+    """Start whatever the environment asks for; safe to call from both main.py and the daemon."""
+    global started
+    with starting:
+        if not ENABLED or started:
+            return
+        started = True
+    port = os.environ.get("ZENURA_METRICS_PORT")
+    if port:
+        serve(int(port))
+    path = os.environ.get("ZENURA_METRICS_DUMP")
+    if path:
+        start_dump(path, float(os.environ.get("ZENURA_METRICS_INTERVAL", DUMP_INTERVAL)))
+    if os.environ.get("ZENURA_PROFILE", "") not in ("", "0"):
+        from modules.language.core.instrumentation import profiler
+        profiler.start(float(os.environ.get("ZENURA_PROFILE_INTERVAL", profiler.INTERVAL)))
@@ -0,0 +1,72 @@
+"""
+Sampling profiler: a background thread records every other thread's stack at a fixed interval.
+
+Samples are kept as collapsed stacks ("outer;inner;leaf count"), the input
+format of flamegraph.pl and speedscope. The profiled code is not touched,
+so the cost is one stack walk per thread per interval.
+"""
+import atexit
+import os
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+
+INTERVAL = 0.01  # Seconds between samples
+OUTPUT = Path("data/neural/language/state/profile.txt")
+
+samples = Counter()
+lock = threading.Lock()
+stop_event = threading.Event()
+thread = None
+
+def frame_stack(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{Path(code.co_filename).stem}.{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+def sample():
+    own = threading.get_ident()
+    stacks = [frame_stack(frame) for ident, frame in sys._current_frames().items() if ident != own]
+    with lock:
+        samples.update(stacks)
+
+def run(interval):
+    while not stop_event.wait(interval):
+        sample()
+
+def start(interval=INTERVAL, output=None):
+    """Start sampling; the profile is written to output (OUTPUT by default) at exit."""
+    global thread
+    if thread is not None:
+        return thread
+    stop_event.clear()
+    thread = threading.Thread(target=run, args=(interval,), daemon=True)
+    thread.start()
+    atexit.register(dump, output or os.environ.get("ZENURA_PROFILE_OUTPUT", OUTPUT))
+    return thread
+
+def stop():
+    global thread
+    stop_event.set()
+    if thread is not None:
+        thread.join()
+        thread = None
+
+def top(n=20):
+    """The n most sampled stacks as (stack, samples)."""
+    with lock:
+        return samples.most_common(n)
+
+def collapsed():
+    with lock:
+        return "".join(f"{stack} {n}\n" for stack, n in samples.most_common())
+
+def dump(path=OUTPUT):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(collapsed())
+    return str(path)
@@ -0,0 +1,183 @@
+"""
+Asyncio ingestion server: many concurrent clients instead of one input() prompt.
+
+The protocol is newline-delimited UTF-8. Each line sent is one input. Each
+reply is one JSON line, {"prediction": ..., "duplicate": ...}, sent in
+request order. The request path does only the cheap work: analysis through
+the content-hash cache, plus the delta prediction. Saving and training are
+queued and run in batches on a worker thread, which appends new inputs and
+one learned table per batch to the memory log. A burst therefore costs a few
+appends rather than two file writes per line.
+
+Learned state is restored at start from the newest snapshot, or else from the
+latest learned delta table in the log. It is checkpointed like the daemon's
+(snapshot, then cursor) every SNAPSHOT_INTERVAL seconds while inputs arrive,
+and once more at shutdown.
+
+    python main.py serve --port 8765
+    python main.py serve --unix /tmp/zenura.sock
+"""
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from modules.language.core.algorithms.basic import delta
+from modules.language.core.analysis import processor
+from modules.language.core.autonomy import daemon
+from modules.language.core.autonomy.cursor import Cursor
+from modules.language.core.instrumentation import metrics
+from modules.language.core.memory import saving, snapshot
+from modules.language.core.memory.log import DIRECTORY as LOG_DIR, MemoryLog
+
+HOST = "127.0.0.1"
+PORT = 8765
+INPUT_DIR = Path("data/neural/language/input/user")  # One-file-per-input memories imported into a new log
+CURSOR_PATH = Path("data/neural/language/state/server_cursor.json")
+SNAPSHOT_DIR = snapshot.DIRECTORY
+SNAPSHOT_INTERVAL = daemon.SNAPSHOT_INTERVAL  # Seconds between checkpoints while inputs arrive
+QUEUE_SIZE = 4096  # Inputs waiting to be saved; a full queue slows clients down
+BATCH_SIZE = 256  # Most inputs saved and trained per background round
+LINE_LIMIT = 1 << 20  # Longest accepted line in bytes
+
+class Server:
+    def __init__(self, log_dir=LOG_DIR, queue_size=QUEUE_SIZE, legacy_dir=INPUT_DIR,
+                 snapshot_dir=SNAPSHOT_DIR, cursor_path=CURSOR_PATH):
+        self.log = MemoryLog(log_dir)
+        self.inputs = saving.DedupStore(self.log, legacy_dir=legacy_dir)
+        self.inputs.start_compaction()
+        self.pending = asyncio.Queue(queue_size)
+        self.worker = ThreadPoolExecutor(max_workers=1)  # One thread, so batches are stored in order
+        self.snapshot_dir = snapshot_dir
+        self.cursor = Cursor(cursor_path)  # Newest log record the live tables are trained on
+        self.checkpointing = None  # Background snapshot writer, if one was started
+        self.checkpoint_at = time.monotonic()
+        self.dirty = False
+        self.restore()
+
+    def restore(self):
+        """Load the newest snapshot, or else the latest learned delta table in the log, into the live tables."""
+        meta = snapshot.restore(self.snapshot_dir)
+        if meta is not None:
+            self.cursor.last = meta["cursor"]
+            self.cursor.count = meta["count"]
+            print(f"Restored {meta['path']}")
+            return
+        tables = self.log.latest_learned("delta")
+        if tables is not None:
+            with delta.lock:
+                delta.elements[:] = tables[0].tolist()
+            self.cursor.last = self.log.latest["delta"]  # The table covers every input stored before it
+            print(f"Restored the delta table from log record {self.cursor.last}")
+
+    def checkpoint(self):
+        """Worker thread: snapshot the tables in the background once SNAPSHOT_INTERVAL has passed."""
+        if self.dirty and time.monotonic() - self.checkpoint_at >= SNAPSHOT_INTERVAL:
+            thread = daemon.checkpoint(self.cursor, self.snapshot_dir)
+            if thread is not None:
+                self.checkpointing = thread
+                self.checkpoint_at = time.monotonic()
+                self.dirty = False
+
+    def respond(self, line):
+        """Analyze and predict one line; returns (reply bytes, result, digest)."""
+        result, seen, key = processor.process_cached(line.decode("utf-8", errors="replace").rstrip("\r\n"))
+        prediction = delta.predict(result["analysis"]["byte"])
+        reply = json.dumps({"prediction": prediction, "duplicate": seen}).encode("utf-8") + b"\n"
+        return reply, result, key
+
+    async def handle(self, reader, writer):
+        metrics.count("server_connections_total")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                with metrics.timer("server_request_seconds"):
+                    reply, result, key = self.respond(line)
+                writer.write(reply)
+                await self.pending.put((result, key))
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass  # Client went away, or sent a line over LINE_LIMIT
+        finally:
+            writer.close()
+
+    def store(self, batch):
+        """Worker thread: save the batch of (result, digest) pairs, then train on the inputs that were new."""
+        fresh = []
+        for result, key in batch:
+            sequence, written = self.inputs.write(result, key)
+            if written:
+                fresh.append(result)
+                self.cursor.advance(sequence)
+        if fresh:
+            learned = delta.train_many(fresh)
+            self.log.append_learned(learned)
+            self.dirty = True
+            self.checkpoint()
+        metrics.count("server_saved_total", len(fresh))
+        metrics.count("server_duplicates_total", len(batch) - len(fresh))
+
+    async def persist(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.pending.get()]
+            while len(batch) < BATCH_SIZE and not self.pending.empty():
+                batch.append(self.pending.get_nowait())
+            metrics.gauge("server_queue_depth", self.pending.qsize())
+            with metrics.timer("server_batch_seconds"):
+                await loop.run_in_executor(self.worker, self.store, batch)
+
+    async def flush(self):
+        """Save whatever is still queued, after any batch in flight; used at shutdown."""
+        batch = []
+        while not self.pending.empty():
+            batch.append(self.pending.get_nowait())
+        if batch:
+            self.worker.submit(self.store, batch)
+        await asyncio.get_running_loop().run_in_executor(None, self.worker.shutdown)
+        if self.checkpointing is not None:
+            self.checkpointing.join()  # Its cursor write must not land after the final one
+        if self.dirty:
+            snapshot.save(self.snapshot_dir, self.cursor)
+            self.cursor.save()
+        self.log.close()  # Stops compaction first, so the index is written after its last change
+        self.inputs.flush()
+
+    async def serve(self, host=HOST, port=PORT, unix=None):
+        if unix:
+            server = await asyncio.start_unix_server(self.handle, unix, limit=LINE_LIMIT)
+        else:
+            server = await asyncio.start_server(self.handle, host, port, limit=LINE_LIMIT)
+        print("Serving on", unix or f"{host}:{port}")
+        persister = asyncio.create_task(self.persist())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            persister.cancel()
+            await self.flush()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve analysis and prediction over TCP or a Unix socket.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--log-dir", type=Path, default=LOG_DIR)
+    parser.add_argument("--legacy-dir", type=Path, default=INPUT_DIR,
+                        help="input files to import when the log holds no inputs yet")
+    parser.add_argument("--snapshot-dir", type=Path, default=SNAPSHOT_DIR)
+    parser.add_argument("--cursor-path", type=Path, default=CURSOR_PATH)
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE)
+    args = parser.parse_args(argv)
+    metrics.setup()
+    server = Server(args.log_dir, args.queue_size, args.legacy_dir, args.snapshot_dir, args.cursor_path)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        print("\nExiting cleanly.")
+
+if __name__ == "__main__":
+    main()
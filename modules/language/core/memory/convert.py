@@ -0,0 +1,39 @@
+import sys
+from pathlib import Path
+from modules.language.core.analysis.result import AnalysisResult
+from modules.language.core.memory import loading, saving
+
+def convert_file(path, remove=False):
+    """Convert one legacy .py memory into the binary format next to it."""
+    path = Path(path)
+    content = path.read_text()
+    if content.startswith("analyzed"):
+        data = loading.load_legacy(path, "analyzed")
+        result = AnalysisResult(bytes(data["analysis"]["byte"]), data["metadata"]["timestamp"])
+        target = Path(saving.write_input_binary(result, path.parent))
+    elif content.startswith("learned"):
+        prefix, day, clock = path.stem.rsplit("_", 2)
+        name = prefix.split("_", 1)[-1]
+        target = Path(saving.write_learned_binary(loading.load_legacy(path, "learned"), path.parent, name, f"{day}_{clock}"))
+    else:
+        raise ValueError(f"{path} is not a memory file")
+    if remove:
+        path.unlink()
+    return str(target)
+
+def convert(directory, remove=False):
+    """Convert every legacy .py memory under directory, returning the new paths."""
+    converted = []
+    for path in sorted(Path(directory).rglob("*.py")):
+        try:
+            converted.append(convert_file(path, remove))
+        except Exception as e:
+            print(f"Error converting {path}: {e}")
+    return converted
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python -m modules.language.core.memory.convert <directory> [--remove]")
+        sys.exit(1)
+    paths = convert(sys.argv[1], "--remove" in sys.argv[2:])
+    print(f"Converted {len(paths)} memory files.")
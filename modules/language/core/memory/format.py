@@ -0,0 +1,72 @@
+import struct
+
+# On-disk layout shared by saving.py and loading.py:
+#
+#   header  (64 bytes, little endian)
+#     magic      4s   b"ZNRM"
+#     version    H
+#     kind       H    KIND_INPUT or KIND_LEARNED
+#     count      I    number of 256-entry tables (learned), 0 for inputs
+#     length     Q    payload size in bytes
+#     timestamp  16s  "%Y%m%d_%H%M%S", NUL padded
+#     name       16s  table name for learned files ("delta", ...), NUL padded
+#   payload
+#     input:   the raw utf-8 bytes of the analyzed text
+#     learned: count * 256 uint8 table entries
+#
+# The payload starts on a 64 byte boundary so it can be viewed straight out
+# of an mmap without copying.
+
+MAGIC = b"ZNRM"
+VERSION = 1
+KIND_INPUT = 1
+KIND_LEARNED = 2
+TABLE_SIZE = 256
+SUFFIX = ".bin"
+
+HEADER = struct.Struct("<4sHHIQ16s16s12x")
+
+def pack_header(kind, length, stamp, count=0, name=""):
+    return HEADER.pack(MAGIC, VERSION, kind, count, length, stamp.encode("ascii"), name.encode("ascii"))
+
+def unpack_header(buffer):
+    magic, version, kind, count, length, stamp, name = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Not a memory file (magic {magic!r})")
+    if version != VERSION:
+        raise ValueError(f"Unsupported memory file version {version}")
+    return {
+        "kind": kind,
+        "count": count,
+        "length": length,
+        "timestamp": stamp.rstrip(b"\0").decode("ascii"),
+        "name": name.rstrip(b"\0").decode("ascii"),
+    }
+
+# Snapshot of all learned state, written by saving.write_snapshot:
+#
+#   header  (32 bytes, little endian)
+#     magic      4s   b"ZNRS"
+#     version    H
+#     count      H    number of arrays
+#     meta       I    size of the JSON metadata that follows the header
+#     length     Q    total file size, to detect truncation
+#   metadata     JSON (cursor position, model parameters, ...)
+#   entries      count * 96 bytes
+#     name       32s  array name, NUL padded
+#     dtype      8s   numpy dtype string ("|u1", "<i8", ...), NUL padded
+#     offset     Q    start of the array data from the top of the file
+#     nbytes     Q
+#     ndim       Q    number of dimensions, at most 4
+#     shape      4Q   dimensions, unused ones 0
+#   array data, each array starting on a 64 byte boundary
+
+SNAPSHOT_MAGIC = b"ZNRS"
+SNAPSHOT_VERSION = 2  # 2: the metadata cursor is a memory log sequence number
+SNAPSHOT_SUFFIX = ".snap"
+SNAPSHOT_HEADER = struct.Struct("<4sHHIQ12x")
+SNAPSHOT_ENTRY = struct.Struct("<32s8sQQQ4Q")
+ALIGNMENT = 64
+
+def align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
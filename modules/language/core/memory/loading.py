@@ -0,0 +1,65 @@
+import json
+import mmap
+from pathlib import Path
+import numpy as np
+from modules.language.core.analysis.result import AnalysisResult
+from modules.language.core.memory import format
+
+def open_mapped(path):
+    """Map a memory file read-only and return (header, payload memoryview)."""
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    header = format.unpack_header(mapped)
+    start = format.HEADER.size
+    end = start + header["length"]
+    if end > len(mapped):
+        raise ValueError(f"Truncated memory file {path}")
+    return header, memoryview(mapped)[start:end]
+
+def load_input(path):
+    """Load an analyzed input as an AnalysisResult backed directly by the mapped file."""
+    header, payload = open_mapped(path)
+    if header["kind"] != format.KIND_INPUT:
+        raise ValueError(f"{path} is not an input memory")
+    return AnalysisResult(payload, header["timestamp"])
+
+def load_learned(path):
+    """Load learned tables as a read-only (count, 256) uint8 array over the mapped file."""
+    header, payload = open_mapped(path)
+    if header["kind"] != format.KIND_LEARNED:
+        raise ValueError(f"{path} is not a learned memory")
+    return np.frombuffer(payload, dtype=np.uint8).reshape(header["count"], format.TABLE_SIZE)
+
+def load_legacy(path, name="analyzed"):
+    """Load a memory written by saving.write_input/write_learned (.py, via exec)."""
+    local_vars = {}
+    exec(Path(path).read_text(), {}, local_vars)
+    return local_vars.get(name)
+
+def load_memory(path):
+    """Load an analyzed input from either format, picked by file suffix."""
+    if Path(path).suffix == format.SUFFIX:
+        return load_input(path)
+    return load_legacy(path)
+
+def load_snapshot(path):
+    """Map a snapshot read-only and return (metadata, {name: array view over the mapped file})."""
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, count, meta_size, length = format.SNAPSHOT_HEADER.unpack_from(mapped, 0)
+    if magic != format.SNAPSHOT_MAGIC:
+        raise ValueError(f"Not a snapshot (magic {magic!r})")
+    if version != format.SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}")
+    if length != len(mapped):
+        raise ValueError(f"Truncated snapshot {path}")
+    start = format.SNAPSHOT_HEADER.size
+    meta = json.loads(bytes(mapped[start:start + meta_size]))
+    arrays = {}
+    for i in range(count):
+        name, dtype, offset, nbytes, ndim, *shape = format.SNAPSHOT_ENTRY.unpack_from(
+            mapped, start + meta_size + i * format.SNAPSHOT_ENTRY.size)
+        dtype = np.dtype(dtype.rstrip(b"\0").decode("ascii"))
+        array = np.frombuffer(mapped, dtype=dtype, count=nbytes // dtype.itemsize, offset=offset)
+        arrays[name.rstrip(b"\0").decode("ascii")] = array.reshape(shape[:ndim])
+    return meta, arrays
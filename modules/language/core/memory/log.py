@@ -0,0 +1,389 @@
+import os
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+from modules.language.core.analysis.result import AnalysisResult
+from modules.language.core.memory import format
+
+try:
+    import fcntl
+except ImportError:  # Not on Windows; writers are then not kept exclusive
+    fcntl = None
+
+# Segmented append-only memory log.
+#
+# A log directory holds segments named <first sequence number>.log. Each is a
+# run of records:
+#
+#   record header  (52 bytes, little endian)
+#     length     I    payload size in bytes
+#     crc        I    CRC-32 of the rest of the header and the payload
+#     sequence   Q    record number, increasing across the whole log
+#     kind       H    format.KIND_INPUT or format.KIND_LEARNED
+#     count      H    number of 256-entry tables (learned), 0 for inputs
+#     timestamp  16s  "%Y%m%d_%H%M%S", NUL padded
+#     name       16s  table name for learned records, NUL padded
+#   payload
+#
+# Writes go to the newest segment only, which rolls over once it reaches
+# SEGMENT_SIZE. A torn record at the end of the newest segment (a crash
+# mid-write) is cut off on open. Older segments are never appended to, so
+# compaction can rewrite them while writers carry on.
+#
+# One process writes a log at a time (it holds an flock on LOCK_NAME); any
+# number of readers open it with readonly=True and pick up new records with
+# refresh(). Every append is flushed to the page cache right away, so readers
+# see it at once; only fsync is batched.
+
+RECORD = struct.Struct("<IIQHH16s16s")
+SEGMENT_SUFFIX = ".log"
+SEGMENT_SIZE = 64 << 20  # Bytes per segment before rolling over
+SYNC_EVERY = 256  # Records written between fsyncs
+SYNC_INTERVAL = 1.0  # Longest time, in seconds, an appended record waits for fsync
+COMPACT_INTERVAL = 60.0  # Seconds between background compaction passes
+LOCK_NAME = "writer.lock"
+DIRECTORY = Path("data/neural/language/log")
+
+def pack_record(sequence, kind, payload, stamp, count=0, name=""):
+    tail = RECORD.pack(0, 0, sequence, kind, count, stamp.encode("ascii"), name.encode("ascii"))[8:]
+    crc = zlib.crc32(payload, zlib.crc32(tail))
+    return struct.pack("<II", len(payload), crc) + tail
+
+def read_records(path, start=0):
+    """Yield (offset, header, payload) for every intact record of a segment from start; stop at the first bad one."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read()
+    offset = 0
+    while offset + RECORD.size <= len(data):
+        length, crc, sequence, kind, count, stamp, name = RECORD.unpack_from(data, offset)
+        begin = offset + RECORD.size
+        payload = data[begin:begin + length]
+        if len(payload) < length or zlib.crc32(payload, zlib.crc32(data[offset + 8:begin])) != crc:
+            break
+        yield start + offset, {
+            "sequence": sequence,
+            "kind": kind,
+            "count": count,
+            "length": length,
+            "timestamp": stamp.rstrip(b"\0").decode("ascii"),
+            "name": name.rstrip(b"\0").decode("ascii"),
+        }, payload
+        offset = begin + length
+
+class MemoryLog:
+    """
+    Append-only store for analyzed inputs and learned tables.
+
+    An in-memory index maps each sequence number to (segment, offset, header),
+    so any record is one pread away, and the newest learned record of each
+    table name is tracked separately for O(1) access to the latest model.
+    fsync is batched: every SYNC_EVERY records, and a background thread
+    syncs whatever is left SYNC_INTERVAL seconds after it was appended.
+    """
+
+    def __init__(self, directory=DIRECTORY, segment_size=SEGMENT_SIZE, sync_every=SYNC_EVERY,
+                 sync_interval=SYNC_INTERVAL, readonly=False):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.readonly = readonly
+        self.lock = threading.RLock()
+        self.index = {}  # sequence -> (segment start, offset, header)
+        self.latest = {}  # learned table name -> sequence
+        self.readers = {}  # segment start -> open file
+        self.segments = []  # Segment starts, oldest first
+        self.ends = {}  # segment start -> end of its last intact record
+        self.inodes = {}  # segment start -> inode it was indexed from; compaction replaces the file
+        self.next_sequence = 0
+        self.unsynced = 0
+        self.synced_at = time.monotonic()
+        self.compactor = None
+        self.syncer = None
+        self.stop = threading.Event()
+        self.active = None
+        self.writer_lock = None
+        if not readonly:
+            self.writer_lock = open(self.directory / LOCK_NAME, "a")
+            if fcntl is not None:
+                try:
+                    fcntl.flock(self.writer_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    self.writer_lock.close()
+                    raise OSError(f"{self.directory} is already open for writing in another process")
+        self.recover()
+        if not readonly:
+            self.active = open(self.segment_path(self.segments[-1]), "ab")
+            if sync_interval:
+                self.syncer = threading.Thread(target=self.sync_forever, args=(sync_interval,), daemon=True)
+                self.syncer.start()
+
+    def segment_path(self, start):
+        return self.directory / f"{start:016d}{SEGMENT_SUFFIX}"
+
+    def on_disk(self):
+        return sorted(int(p.stem) for p in self.directory.glob(f"*{SEGMENT_SUFFIX}"))
+
+    def recover(self):
+        """Rebuild the index from the segments on disk; a writer also cuts off a torn tail."""
+        self.segments = self.on_disk()
+        for segment in self.segments:
+            self.scan(segment)
+        if self.readonly:
+            return
+        if self.segments:
+            os.truncate(self.segment_path(self.segments[-1]), self.ends[self.segments[-1]])
+        else:
+            self.segments = [0]
+            self.ends[0] = 0
+            self.segment_path(0).touch()
+
+    def scan(self, segment, start=0):
+        """Index the intact records of a segment from start on."""
+        end = start
+        try:
+            self.inodes[segment] = os.stat(self.segment_path(segment)).st_ino
+            for offset, header, _ in read_records(self.segment_path(segment), start):
+                self.add_to_index(segment, offset, header)
+                end = offset + RECORD.size + header["length"]
+        except FileNotFoundError:
+            pass  # Compacted away since it was listed
+        self.ends[segment] = end
+
+    def refresh(self):
+        """Reader: index records appended (and segments added or removed) by the writer since the last call."""
+        with self.lock:
+            present = self.on_disk()
+            gone = set(self.segments) - set(present)
+            if gone:
+                for sequence in [s for s, (segment, _, _) in self.index.items() if segment in gone]:
+                    del self.index[sequence]
+                for segment in gone:
+                    self.ends.pop(segment, None)
+                    self.inodes.pop(segment, None)
+                    reader = self.readers.pop(segment, None)
+                    if reader is not None:
+                        reader.close()
+            last = self.segments[-1] if self.segments and self.segments[-1] in present else -1
+            self.segments = present
+            for segment in present:
+                try:
+                    replaced = self.inodes.get(segment, -1) != os.stat(self.segment_path(segment)).st_ino
+                except FileNotFoundError:
+                    continue
+                if segment in self.inodes and replaced:
+                    self.reindex(segment)
+                elif segment >= last or replaced:
+                    self.scan(segment, self.ends.get(segment, 0))
+
+    def reindex(self, segment):
+        """Re-read a segment whose records moved (compacted by the writer since it was indexed)."""
+        for sequence in [s for s, (seg, _, _) in self.index.items() if seg == segment]:
+            del self.index[sequence]
+        reader = self.readers.pop(segment, None)
+        if reader is not None:
+            reader.close()
+        self.scan(segment)
+
+    def add_to_index(self, segment, offset, header):
+        sequence = header["sequence"]
+        self.index[sequence] = (segment, offset, header)
+        self.next_sequence = max(self.next_sequence, sequence + 1)
+        if header["kind"] == format.KIND_LEARNED:
+            name = header["name"]
+            if sequence >= self.latest.get(name, -1):
+                self.latest[name] = sequence
+
+    def append(self, kind, payload, stamp, count=0, name=""):
+        """Append one record and return its sequence number."""
+        payload = bytes(payload)
+        with self.lock:
+            if self.active.tell() >= self.segment_size:
+                self.roll()
+            sequence = self.next_sequence
+            header = pack_record(sequence, kind, payload, stamp, count, name)
+            offset = self.active.tell()
+            self.active.write(header)
+            self.active.write(payload)
+            self.active.flush()  # Visible to readers now; durable at the next sync
+            self.add_to_index(self.segments[-1], offset, {
+                "sequence": sequence, "kind": kind, "count": count, "length": len(payload),
+                "timestamp": stamp, "name": name,
+            })
+            self.ends[self.segments[-1]] = self.active.tell()
+            self.unsynced += 1
+            if self.unsynced >= self.sync_every:
+                self.sync()
+            return sequence
+
+    def append_input(self, data):
+        return self.append(format.KIND_INPUT, data["analysis"]["byte"], data["metadata"]["timestamp"])
+
+    def append_learned(self, data, name="delta", timestamp=None):
+        timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+        tables = np.asarray(data, dtype=np.uint8).reshape(-1, format.TABLE_SIZE)
+        return self.append(format.KIND_LEARNED, tables.tobytes(), timestamp, len(tables), name)
+
+    def sync(self):
+        with self.lock:
+            self.active.flush()
+            os.fsync(self.active.fileno())
+            self.unsynced = 0
+            self.synced_at = time.monotonic()
+
+    def sync_forever(self, interval):
+        """Background thread: fsync records that have waited interval seconds, until close()."""
+        while not self.stop.wait(max(0.0, self.synced_at + interval - time.monotonic())):
+            with self.lock:
+                if self.unsynced and time.monotonic() - self.synced_at >= interval:
+                    self.sync()
+                elif not self.unsynced:
+                    self.synced_at = time.monotonic()
+
+    def roll(self):
+        """Seal the active segment and start a new one."""
+        self.sync()
+        self.active.close()
+        self.segments.append(self.next_sequence)
+        self.ends[self.next_sequence] = 0
+        self.active = open(self.segment_path(self.next_sequence), "ab")
+
+    def read(self, sequence):
+        """(header, payload bytes) of one record."""
+        with self.lock:
+            for attempt in range(2):
+                segment, offset, header = self.index[sequence]
+                reader = self.readers.get(segment)
+                if reader is None:
+                    reader = self.readers[segment] = open(self.segment_path(segment), "rb")
+                data = os.pread(reader.fileno(), RECORD.size + header["length"], offset)
+                if len(data) == RECORD.size + header["length"] and RECORD.unpack_from(data)[2] == sequence:
+                    return header, data[RECORD.size:]
+                if self.readonly and attempt == 0:
+                    self.reindex(segment)  # The writer compacted this segment under us
+            raise KeyError(sequence)
+
+    def locate(self, sequence):
+        """(segment path, payload offset, length, timestamp) of a record, for workers that read it themselves."""
+        with self.lock:
+            segment, offset, header = self.index[sequence]
+            return str(self.segment_path(segment)), offset + RECORD.size, header["length"], header["timestamp"]
+
+    def load_input(self, sequence):
+        header, payload = self.read(sequence)
+        if header["kind"] != format.KIND_INPUT:
+            raise ValueError(f"Record {sequence} is not an input memory")
+        return AnalysisResult(payload, header["timestamp"])
+
+    def load_learned(self, sequence):
+        header, payload = self.read(sequence)
+        if header["kind"] != format.KIND_LEARNED:
+            raise ValueError(f"Record {sequence} is not a learned memory")
+        return np.frombuffer(payload, dtype=np.uint8).reshape(header["count"], format.TABLE_SIZE)
+
+    def latest_learned(self, name="delta"):
+        """Newest learned tables for name, or None if none were logged."""
+        sequence = self.latest.get(name)
+        return None if sequence is None else self.load_learned(sequence)
+
+    def sequences(self, kind=None, after=-1):
+        """Sequence numbers of the records newer than after, oldest first; costs O(records after it)."""
+        with self.lock:
+            index = self.index
+            return [s for s in range(after + 1, self.next_sequence)
+                    if s in index and (kind is None or index[s][2]["kind"] == kind)]
+
+    def compact(self, drop=()):
+        """
+        Rewrite every sealed segment without its superseded learned records.
+
+        Inputs are kept unless their sequence number is in drop; of the learned
+        records only the newest per table name survive. Segments left empty
+        are deleted.
+        """
+        drop = set(drop)
+        with self.lock:
+            sealed = self.segments[:-1]
+            keep = set(self.latest.values())
+        for segment in sealed:
+            path = self.segment_path(segment)
+            records = list(read_records(path))
+            survivors = [r for r in records if r[1]["sequence"] not in drop and
+                         (r[1]["kind"] != format.KIND_LEARNED or r[1]["sequence"] in keep)]
+            if len(survivors) == len(records):
+                continue
+            tmp = path.with_suffix(".compact")
+            moved = []
+            with open(tmp, "wb") as f:
+                for _, header, payload in survivors:
+                    moved.append((f.tell(), header))
+                    f.write(pack_record(header["sequence"], header["kind"], payload, header["timestamp"],
+                                        header["count"], header["name"]))
+                    f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            with self.lock:
+                # Dropped records were superseded when keep was taken; later ones go next pass
+                for _, header, _ in records:
+                    self.index.pop(header["sequence"], None)
+                reader = self.readers.pop(segment, None)
+                if reader is not None:
+                    reader.close()
+                if moved:
+                    os.replace(tmp, path)
+                    self.inodes[segment] = os.stat(path).st_ino
+                    for offset, header in moved:
+                        self.index[header["sequence"]] = (segment, offset, header)
+                    self.ends[segment] = offset + RECORD.size + header["length"]
+                else:
+                    tmp.unlink()
+                    path.unlink()
+                    self.segments.remove(segment)
+                    self.ends.pop(segment, None)
+                    self.inodes.pop(segment, None)
+
+    def compact_forever(self, interval, compact=None):
+        while not self.stop.wait(interval):
+            (compact or self.compact)()
+
+    def start_compaction(self, interval=COMPACT_INTERVAL, compact=None):
+        """Run compact() (or the given callable) every interval seconds on a background thread until close()."""
+        if self.compactor is None:
+            self.compactor = threading.Thread(target=self.compact_forever, args=(interval, compact), daemon=True)
+            self.compactor.start()
+        return self.compactor
+
+    def close(self):
+        self.stop.set()
+        for thread in (self.compactor, self.syncer):
+            if thread is not None:
+                thread.join()
+        with self.lock:
+            if self.active is not None:
+                self.sync()
+                self.active.close()
+                self.active = None
+            for reader in self.readers.values():
+                reader.close()
+            self.readers.clear()
+            if self.writer_lock is not None:
+                self.writer_lock.close()  # Releases the flock
+                self.writer_lock = None
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, sequence):
+        return sequence in self.index
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,5 +1,16 @@
+import json
+import os
+import threading
 from datetime import datetime
 from pathlib import Path
+import numpy as np
+from modules.language.core.analysis import cache
+from modules.language.core.analysis.result import AnalysisResult
+from modules.language.core.memory import format, loading
+from modules.language.core.memory.log import COMPACT_INTERVAL
+
+DEDUP_INDEX = "dedup_index.json"
+FLUSH_EVERY = 64  # Reference count changes buffered before the index is rewritten
 
 def write_input(data, base_path):
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -14,3 +25,162 @@ def write_learned(data, base_path):
     full_path = Path(base_path) / filename
     full_path.write_text(f"learned = {repr(data)}\n")
     return str(full_path)
+
+def write_input_binary(data, base_path, tag=None):
+    stamp = data["metadata"]["timestamp"]
+    payload = data["analysis"]["byte"]
+    filename = f"user_input_{stamp}_{tag}{format.SUFFIX}" if tag else f"user_input_{stamp}{format.SUFFIX}"
+    full_path = Path(base_path) / filename
+    with open(full_path, "wb") as f:
+        f.write(format.pack_header(format.KIND_INPUT, len(payload), stamp))
+        f.write(payload)
+    return str(full_path)
+
+def write_learned_binary(data, base_path, name="delta", timestamp=None):
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    tables = np.asarray(data, dtype=np.uint8).reshape(-1, format.TABLE_SIZE)
+    filename = f"learned_{name}_{timestamp}{format.SUFFIX}"
+    full_path = Path(base_path) / filename
+    with open(full_path, "wb") as f:
+        f.write(format.pack_header(format.KIND_LEARNED, tables.nbytes, timestamp, len(tables), name))
+        f.write(tables.tobytes())
+    return str(full_path)
+
+def write_snapshot(arrays, meta, path):
+    """Atomically write named arrays plus JSON metadata as one snapshot file (layout in format.py)."""
+    path = Path(path)
+    arrays = {name: np.asarray(value, order="C") for name, value in arrays.items()}
+    meta_bytes = json.dumps(meta).encode("utf-8")
+    offset = format.align(format.SNAPSHOT_HEADER.size + len(meta_bytes) + format.SNAPSHOT_ENTRY.size * len(arrays))
+    entries = []
+    for name, value in arrays.items():
+        shape = list(value.shape) + [0] * (4 - value.ndim)
+        entries.append(format.SNAPSHOT_ENTRY.pack(name.encode("ascii"), value.dtype.str.encode("ascii"),
+                                                  offset, value.nbytes, value.ndim, *shape))
+        offset = format.align(offset + value.nbytes)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        f.write(format.SNAPSHOT_HEADER.pack(format.SNAPSHOT_MAGIC, format.SNAPSHOT_VERSION, len(arrays),
+                                            len(meta_bytes), offset))
+        f.write(meta_bytes)
+        f.write(b"".join(entries))
+        for value in arrays.values():
+            f.seek(format.align(f.tell()))
+            f.write(value.data)
+        f.truncate(offset)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return str(path)
+
+class DedupStore:
+    """
+    Content-addressed input store over a memory log: each distinct payload is appended once.
+
+    The index maps the payload digest to its record's sequence number and a
+    reference count. Counts change in memory and are written out every
+    FLUSH_EVERY changes and on flush(), with an atomic replace. A duplicate
+    therefore costs a hash and a dict update, no disk I/O. Records are
+    numbered in the order they are stored, which is the order the daemon's
+    cursor follows.
+    """
+
+    def __init__(self, log, flush_every=FLUSH_EVERY, legacy_dir=None):
+        """
+        Args:
+            log (MemoryLog): Log opened for writing.
+            flush_every (int): Reference count changes buffered before the index is rewritten.
+            legacy_dir (str | Path | None): Directory of one-file-per-input memories, imported
+                once into a log that holds no inputs yet.
+        """
+        self.log = log
+        self.index_path = log.directory / DEDUP_INDEX
+        self.flush_every = flush_every
+        self.lock = threading.Lock()
+        self.entries = {}  # digest -> [sequence, reference count]
+        self.released = []  # Sequences of inputs whose last reference was dropped, removed at compact()
+        self.dirty = 0
+        if self.index_path.exists():
+            state = json.loads(self.index_path.read_text())
+            self.entries = state["entries"]
+            self.released = state["released"]
+        if legacy_dir is not None and not log.sequences(format.KIND_INPUT):
+            self.migrate(legacy_dir)
+
+    def migrate(self, directory):
+        """Append every .bin/.py input memory in directory, oldest name first; returns how many were stored."""
+        directory = Path(directory)
+        if not directory.is_dir():
+            return 0
+        names = sorted(p.name for p in directory.iterdir()
+                       if p.suffix in (format.SUFFIX, ".py") and p.name.startswith("user_input_"))
+        stored = 0
+        for name in names:
+            try:
+                memory = loading.load_memory(directory / name)
+                if not isinstance(memory, AnalysisResult):
+                    memory = AnalysisResult(bytes(memory["analysis"]["byte"]), memory["metadata"]["timestamp"])
+                stored += self.write(memory)[1]
+            except Exception as e:
+                print(f"Skipping {name}: {e}")
+        self.flush()
+        return stored
+
+    def write(self, data, key=None):
+        """Store data unless its payload is already stored; returns (sequence, written)."""
+        key = key or cache.digest(data["analysis"]["byte"])
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] in self.log:
+                entry[1] += 1
+                written = False
+            else:
+                entry = self.entries[key] = [self.log.append_input(data), 1]
+                written = True
+            self.changed()
+        return entry[0], written
+
+    def release(self, key):
+        """Drop one reference; the record is removed by the next compact() after the last one."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self.entries[key]
+                self.released.append(entry[0])
+            self.changed()
+
+    def refs(self, key):
+        entry = self.entries.get(key)
+        return entry[1] if entry else 0
+
+    def changed(self):
+        self.dirty += 1
+        if self.dirty >= self.flush_every:
+            self.save()
+
+    def save(self):
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"entries": self.entries, "released": self.released}))
+        os.replace(tmp, self.index_path)
+        self.dirty = 0
+
+    def flush(self):
+        with self.lock:
+            if self.dirty:
+                self.save()
+
+    def compact(self):
+        """Compact the log, removing released inputs along with superseded learned tables."""
+        with self.lock:
+            released = list(self.released)
+        self.log.compact(drop=released)
+        with self.lock:
+            self.released = self.released[len(released):]
+            self.changed()
+
+    def start_compaction(self, interval=COMPACT_INTERVAL):
+        """Run compact() on the log's background compaction thread every interval seconds, until log.close()."""
+        return self.log.start_compaction(interval, self.compact)
@@ -0,0 +1,166 @@
+import re
+import threading
+from pathlib import Path
+import numpy as np
+from modules.language.core.algorithms import layered
+from modules.language.core.algorithms.basic import byte, delta, ngram, xor
+from modules.language.core.algorithms.experimental import dynamic
+from modules.language.core.algorithms.experimental.morphological import RuleArrays
+from modules.language.core.memory import format, loading, saving
+
+# Versioned snapshots of all learned state, for warm starts.
+#
+# A snapshot holds the byte/delta/xor tables, the n-gram table, the word
+# co-occurrence matrix (with its vocabulary and top-k cache), the layered
+# learner's temporal marks and optionally a rule population. Its metadata
+# records the daemon cursor it is consistent with, so after restore() only
+# memories newer than that need replaying. Files are named
+# snapshot_<version>.snap, written to a temporary name and renamed into
+# place, and the newest KEEP are kept.
+
+DIRECTORY = Path("data/neural/language/state/snapshots")
+KEEP = 3
+NAME_RE = re.compile(r"snapshot_(\d+)" + re.escape(format.SNAPSHOT_SUFFIX) + "$")
+TABLES = {"byte": byte, "delta": delta, "xor": xor}
+
+writing = threading.Lock()  # One snapshot written at a time
+
+def capture(cursor=None, rules=None):
+    """
+    Copy the current learned state.
+
+    Args:
+        cursor (Cursor | None): Daemon cursor the state is consistent with.
+        rules (RuleArrays | None): Rule population to include.
+
+    Returns:
+        tuple[dict, dict[str, np.ndarray]]: (metadata, arrays) for saving.write_snapshot.
+    """
+    arrays = {}
+    for name, module in TABLES.items():
+        with module.lock:
+            arrays[name] = np.asarray(module.elements, dtype=np.uint8)
+    with ngram.lock:
+        arrays["ngram"] = ngram.elements.copy()
+        order, bits = ngram.ORDER, ngram.BITS
+
+    matrix = dynamic.word_cooccurrence
+    matrix.flush()
+    arrays["cooccurrence.keys"] = matrix.keys.copy()
+    arrays["cooccurrence.counts"] = matrix.counts.copy()
+    arrays["cooccurrence.top"] = matrix.top.copy()
+    arrays["cooccurrence.words"] = np.frombuffer("\0".join(matrix.vocab.words).encode("utf-8"), dtype=np.uint8)
+
+    with layered.lock:
+        arrays["layered.temporal"] = layered.temporal.copy()
+        tick = layered.tick
+
+    if rules is not None:
+        arrays["rules.op"] = rules.op.copy()
+        arrays["rules.target"] = rules.target.copy()
+        arrays["rules.exp"] = rules.exp.copy()
+        arrays["rules.strength"] = rules.strength.copy()
+
+    meta = {
+        "cursor": cursor.last if cursor is not None else -1,
+        "count": cursor.count if cursor is not None else 0,
+        "ngram": {"order": order, "bits": bits},
+        "cooccurrence": {"k": matrix.k, "words": len(matrix.vocab)},
+        "layered": {"tick": tick},
+    }
+    return meta, arrays
+
+def versions(directory=DIRECTORY):
+    """Snapshot paths in directory, newest first."""
+    found = []
+    for path in Path(directory).glob(f"snapshot_*{format.SNAPSHOT_SUFFIX}"):
+        match = NAME_RE.match(path.name)
+        if match:
+            found.append((int(match.group(1)), path))
+    return [path for _, path in sorted(found, reverse=True)]
+
+def save(directory=DIRECTORY, cursor=None, rules=None, captured=None):
+    """Write the next snapshot version and drop all but the newest KEEP; returns its path."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    meta, arrays = captured or capture(cursor, rules)
+    with writing:
+        existing = versions(directory)
+        version = int(NAME_RE.match(existing[0].name).group(1)) + 1 if existing else 1
+        meta["version"] = version
+        path = saving.write_snapshot(arrays, meta, directory / f"snapshot_{version:08d}{format.SNAPSHOT_SUFFIX}")
+        for old in versions(directory)[KEEP:]:
+            old.unlink(missing_ok=True)
+    return path
+
+def save_async(directory=DIRECTORY, cursor=None, rules=None, then=None):
+    """
+    Capture the state now and write it on a background thread.
+
+    Args:
+        then (callable | None): Called with the snapshot path once it is written.
+
+    Returns:
+        threading.Thread | None: The writer, or None if a previous snapshot is still being written.
+    """
+    if writing.locked():
+        return None
+    captured = capture(cursor, rules)
+
+    def write():
+        path = save(directory, None, None, captured)
+        if then is not None:
+            then(path)
+
+    thread = threading.Thread(target=write, daemon=True)
+    thread.start()
+    return thread
+
+def restore(directory=DIRECTORY):
+    """
+    Load the newest readable snapshot into the live modules.
+
+    Returns:
+        dict | None: Its metadata, with the rule population under "rules" if one was saved;
+        None if there is no snapshot.
+    """
+    for path in versions(directory):
+        try:
+            meta, arrays = loading.load_snapshot(path)
+        except (ValueError, OSError) as e:
+            print(f"Skipping snapshot {path}: {e}")
+            continue
+        apply(meta, arrays)
+        meta["path"] = str(path)
+        return meta
+    return None
+
+def apply(meta, arrays):
+    """Copy loaded snapshot arrays into the live modules."""
+    for name, module in TABLES.items():
+        with module.lock:
+            module.elements[:] = arrays[name].tolist()
+
+    ngram.configure(meta["ngram"]["order"], meta["ngram"]["bits"])
+    with ngram.lock:
+        ngram.elements[:] = arrays["ngram"]
+
+    matrix = dynamic.word_cooccurrence
+    words = bytes(arrays["cooccurrence.words"]).decode("utf-8").split("\0") if meta["cooccurrence"]["words"] else []
+    matrix.vocab.words = words
+    matrix.vocab.ids = {word: i for i, word in enumerate(words)}
+    matrix.keys = arrays["cooccurrence.keys"].copy()
+    matrix.counts = arrays["cooccurrence.counts"].copy()
+    matrix.top = arrays["cooccurrence.top"].copy()
+    matrix.fresh_keys = np.empty(0, dtype=np.int64)
+    matrix.fresh_counts = np.empty(0, dtype=np.uint32)
+    matrix.pending = []
+    matrix.pending_size = 0
+
+    with layered.lock:
+        layered.temporal[:] = arrays["layered.temporal"]
+        layered.tick = meta["layered"]["tick"]
+
+    if "rules.op" in arrays:
+        meta["rules"] = RuleArrays(arrays["rules.op"], arrays["rules.target"], arrays["rules.exp"],
+                                   arrays["rules.strength"].copy())